@@ -1,1813 +1,2125 @@
-import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-import numpy as np
-import seaborn as sns
-import re
-from datetime import datetime, date
-import io
-import json
-import time
-
-# NEW IMPORTS FOR POSTGRESQL
-import psycopg2
-import psycopg2.extras
-
-st.set_page_config(page_title="Sales Call Dashboard", layout="wide")
-sns.set(style="whitegrid")
-
-# --- Configuration for PostgreSQL ---
-try:
-    db_credentials = st.secrets["postgres"]
-    DB_NAME = db_credentials["dbname"]
-    DB_USER = db_credentials["user"]
-    DB_PASSWORD = db_credentials["password"]
-    DB_HOST = db_credentials["host"]
-    DB_PORT = db_credentials["port"]
-except KeyError:
-    st.error("PostgreSQL credentials not found in Streamlit secrets. Please configure them in .streamlit/secrets.toml.")
-    DB_NAME = "sales_dashboard_db"
-    DB_USER = "postgres"
-    DB_PASSWORD = "Your Password"  # Replace with your actual PostgreSQL password if not using secrets
-    DB_HOST = "localhost"
-    DB_PORT = "5432"
-
-# --- Define Expected DB Columns Manually ---
-expected_db_columns = [
-    'name', 'email', 'number', 'country_name', 'remarks', 'agent', 'first_call_date',
-    'status', 'notes_from_call', 'post_call_email', 'tags', 'interested_category', 'sales_status',
-    'sales_amount', 'next_follow_up_time', 'next_follow_up_date', 'Calling_Stamp', 'Signup_Date'
-]
-
-# --- Data Loading (Cached - Modified for PostgreSQL) ---
-@st.cache_data(ttl=60)
-def load_full_sales_data_from_db(db_host, db_name, db_user, db_password, db_port, expected_cols):
-    conn = None
-    df = pd.DataFrame()
-    try:
-        conn = psycopg2.connect(
-            host=db_host,
-            database=db_name,
-            user=db_user,
-            password=db_password,
-            port=db_port
-        )
-        cursor = conn.cursor()
-
-        # Quote all column names for the SQL query
-        quoted_cols = [f'"{col}"' for col in expected_cols]
-        
-        # Fetch all data from the sales_data table
-        cursor.execute(f"SELECT {', '.join(quoted_cols)} FROM sales_data;")
-        data = cursor.fetchall()
-        
-        # Get column names directly from cursor description
-        col_names = [desc[0] for desc in cursor.description]
-
-        df_raw = pd.DataFrame(data, columns=col_names)
-        
-        # Ensure column names are consistent (lowercase, underscores)
-        df_raw.columns = df_raw.columns.str.lower().str.strip().str.replace(' ', '_').str.replace('&', 'and')
-
-        # --- Post-processing (similar to your original GSheet loading, but adjusted for DB column names) ---
-        
-        # Process first_call_date to identify initial calls
-        if 'first_call_date' in df_raw.columns:
-            df_raw['date_called'] = pd.to_datetime(df_raw['first_call_date'], errors='coerce')
-            df_raw['is_initial_call'] = df_raw['date_called'].notna().astype(int)
-        else:
-            df_raw['date_called'] = pd.NaT
-            df_raw['is_initial_call'] = 0
-            st.warning("Column 'first_call_date' not found in database. Initial call metrics may be inaccurate.")
-
-        # Convert sales_amount to numeric
-        if 'sales_amount' in df_raw.columns:
-            df_raw['sales_amount'] = pd.to_numeric(df_raw['sales_amount'], errors='coerce').fillna(0)
-        else:
-            df_raw['sales_amount'] = 0
-            st.warning("Column 'sales_amount' not found. Sales metrics will be zero.")
-
-        follow_up_date_db_columns_for_parsing = [
-            'next_follow_up_date'
-        ]
-        for col_name in follow_up_date_db_columns_for_parsing:
-            if col_name in df_raw.columns:
-                df_raw[col_name] = pd.to_datetime(df_raw[col_name], errors='coerce').dt.date
-            else:
-                # Ensure the column exists even if empty, with NaT
-                df_raw[col_name] = pd.NaT
-
-        # Standardize status column
-        # For 'status'
-        if 'status' in df_raw.columns:
-            # Convert to string, ensuring actual NaN/None become string 'nan'/'None'
-            df_raw['status'] = df_raw['status'].astype(str).str.strip().str.lower()
-            status_mapping = {
-                'answered call': 'Answered',
-                'answered': 'Answered',
-                'not answered': 'Not answered',
-                'invalid number': 'Invalid number',
-                'silent call/voicemail': 'Voicemail',
-                'voicemail': 'Voicemail',
-            }
-            df_raw['status'] = df_raw['status'].map(status_mapping)
-            # Now, any unmapped values or original NaNs are handled.
-            # Apply title case for display, but be careful with "Not answered"
-            df_raw['status'] = df_raw['status'].apply(lambda x: x.title() if pd.notna(x) else x)
-            df_raw['status'].replace({"Invalid Number": "Invalid number", "Not Answered": "Not answered"}, inplace=True)
-        else:
-            df_raw['status'] = 'nan' # Fallback for missing column
-
-
-        # For 'sales_status'
-        if 'sales_status' in df_raw.columns:
-            df_raw['sales_status'] = df_raw['sales_status'].astype(str).str.strip().str.lower()
-            sales_status_mapping = {
-                'sold': 'Converted',
-                'deal won': 'Converted',
-                'deal complete': 'Converted',
-                'converted': 'Converted',
-                'lost': 'Not interested',
-                'no interest': 'Not interested',
-                'not interested (n)': 'Not interested',
-                'not interested': 'Not interested',
-                'follow up': 'Follow up',
-                'f': 'Follow up',
-            }
-            df_raw['sales_status'] = df_raw['sales_status'].map(sales_status_mapping)
-            df_raw['sales_status'] = df_raw['sales_status'].apply(lambda x: x.title() if pd.notna(x) else x)
-        else:
-            df_raw['sales_status'] = 'nan'
-
-        # Extract Issues from Tags
-        if 'tags' in df_raw.columns:
-            df_raw['issues'] = df_raw['tags'].str.extract(
-                r'(Language Barriers|KYC Issues & Complaints|Bonus or Promotions|Network, Inaudible Conversation|Interested|Spread, Leverage & Platform Concerns|Future Deposit|Withdrawal complaint|Wrong number claim|Busy|Geographical permission needed|VOIP restricted country|Payment method issue|Platform Issue|Answered by Another Person|Explorer|Partners Program)',
-                flags=re.IGNORECASE
-            )
-            df_raw['issues'].fillna('N/A', inplace=True)
-        else:
-            df_raw['issues'] = 'N/A'
-            st.warning("Column 'tags' not found. Issue analysis will be unavailable.")
-
-        # Extract call_outcome from status
-        df_raw['call_outcome'] = df_raw['status'].str.extract(
-            r'(Answered|Not answered|Invalid number|Voicemail)',
-            flags=re.IGNORECASE
-        )
-        
-        # Handle country_name consistency
-        if 'country_name' not in df_raw.columns:
-            df_raw['country_name'] = 'Unknown'
-            st.warning("Column 'country_name' not found. Country analysis will be limited.")
-        
-        # Assign country_group
-        df_raw['country_group'] = np.where(
-            df_raw['country_name'].isin(['India', 'Pakistan', 'Bangladesh']), 'South Asia',
-            np.where(df_raw['country_name'].isin(['Brazil', 'Argentina', 'Colombia']), 'Latin America',
-            np.where(df_raw['country_name'].isin(['Iraq', 'Saudi Arabia', 'United Arab Emirates']), 'Middle East', 'Other'))
-        )
-
-        # --- FOLLOW-UP CALL COUNTING LOGIC ---
-        df_raw['total_follow_up_calls'] = 0
-        follow_up_date_db_columns = [
-            'next_follow_up_date'
-        ]
-
-        today = datetime.now().date()
-
-        for col_name in follow_up_date_db_columns:
-            if col_name in df_raw.columns:
-                df_raw[col_name] = pd.to_datetime(df_raw[col_name], errors='coerce').dt.date
-                df_raw['total_follow_up_calls'] += (
-                    (df_raw[col_name].notna()) &
-                    (df_raw[col_name] <= today) # Only count calls made till today
-                ).astype(int)
-            else:
-                st.warning(f"Follow-up column '{col_name}' not found in database. Follow-up counts may be incomplete.")
-
-        # Process next_follow_up_date and time
-        if 'next_follow_up_date' in df_raw.columns:
-            df_raw['next_follow_up_date'] = pd.to_datetime(df_raw['next_follow_up_date'], errors='coerce').dt.date
-        else:
-            df_raw['next_follow_up_date'] = pd.NaT
-
-        if 'next_follow_up_time' in df_raw.columns:
-            df_raw['next_follow_up_time'] = df_raw['next_follow_up_time'].astype(str).replace('NaT', '').replace('nan', '').str.strip()
-        else:
-            df_raw['next_follow_up_time'] = ''
-            
-        # Ensure 'email' column exists
-        if 'email' not in df_raw.columns:
-            df_raw['email'] = ''
-        if 'agent' not in df_raw.columns:
-            df_raw['agent'] = 'Unknown'
-
-        return df_raw
-
-    except psycopg2.Error as e:
-        st.error(f"Error connecting to or querying PostgreSQL database: {e}")
-        st.warning("Displaying a **sample dataset** for visual reference due to database loading issues.")
-        return pd.DataFrame()  
-    finally:
-        if conn:
-            conn.close()
-
-# Dashboard always runs now
-refresh_interval = st.sidebar.number_input("Auto-refresh interval (seconds)", min_value=0, value=0, key="refresh_interval_input")
-
-
-df = pd.DataFrame()
-data_load_success = False
-
-if 'DB_NAME' in locals() and DB_NAME:
-    df = load_full_sales_data_from_db(DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, DB_PORT, expected_db_columns)
-    if not df.empty:
-        data_load_success = True
-        if "data_loaded_message_shown" not in st.session_state:
-            success_message = st.empty()
-            success_message.success(f"Loaded {len(df)} records from PostgreSQL!", icon="✅")
-            time.sleep(1)
-            success_message.empty()
-            st.session_state.data_loaded_message_shown = True
-    else:
-        st.error("Failed to load data from PostgreSQL. Check console for errors or Streamlit secrets.")
-        # Sample Data for fallback
-        df = pd.DataFrame({
-            'name': ['Test User 1', 'Test User 2', 'Test User 3', 'Test User 4', 'Test User 5', 'Test User 6', 'Test User 7', 'Test User 8', 'Test User 9', 'Test User 10', 'Test User 11'],
-            'email': ['test1@example.com', 'test2@example.com', 'test3@example.com', 'test4@example.com', 'test5@example.com', 'test6@example.com', 'test7@example.com', 'test8@example.com', 'test9@example.com', 'test10@example.com', 'test11@example.com'],
-            'number': ['111', '222', '333', '434', '555', '666', '777', '888', '999', '000', '123'],
-            'sales_status': ['Follow up', 'Not interested', 'Converted', 'Follow up', 'Converted', 'Converted', 'Follow up', 'Converted', 'Not interested', 'Follow up', 'Converted'],
-            'sales_amount': [1000.0, 0.0, 500.0, 0.0, 750.0, 2000.0, 300.0, 1200.0, 0.0, 0.0, 800.0],
-            'next_follow_up_time': ['10:00 AM', '', '', '02:30 PM', '', '11:00 AM', '', '', '', '', '09:00 AM'],
-            'next_follow_up_date': ['2023-07-26', '2023-08-01', None, '2023-07-16', None, '2023-07-26', '2023-08-01', None, None, None, '2023-08-15'],
-            'remarks': ['Good', 'Fair', 'Excellent', 'Poor', 'Good', 'Excellent', 'Good', 'Fair', 'Poor', 'Good', 'Excellent'],
-            'agent': ['Agent A', 'Agent B', 'Agent A', 'Agent C', 'Agent B', 'Agent D', 'Agent A', 'Agent E', 'Agent F', 'Agent E', 'Agent G'],
-            'first_call_date': ['2023-01-01', '2023-01-05', '2023-01-10', '2023-01-15', '2023-01-20', '2023-01-25', '2023-01-28', '2023-02-01', '2023-02-05', '2023-02-10', '2023-02-12'],
-            'status': ['Answered', 'Not answered', 'Answered', 'Voicemail', 'Answered', 'Answered', 'Answered', 'Answered', 'Answered', 'Not answered', 'Answered'],
-            'notes_from_call': ['Detailed discussion', 'No answer', 'Converted lead', 'Left voicemail', 'Platform discussed', 'High interest', 'Follow up needed', 'Interested in future', 'Complaint received', 'Busy, call back', 'Converted lead'],
-            'tags': ['Language Barriers', 'N/A', 'Interested', 'N/A', 'Platform Issue', 'N/A', 'Interested', 'N/A', 'KYC Issues & Complaints', 'N/A', 'N/A'],
-            'interested_category': ['Hot Lead (1-3 Days)', 'Warm Lead (1-2 weeks)', 'Warm Lead (1 month)', 'Cold Lead (1-3 Months)', 'Hot Lead (1-3 Days)', 'Warm Lead (1-2 weeks)', 'Hot Lead (1-3 Days)', 'Warm Lead (1-2 weeks)', 'Cold Lead (1-3 Months)', 'Cold Lead (1-3 Months)', 'Warm Lead (1-2 weeks)'],
-            'country_name': ['India', 'Brazil', 'Pakistan', 'Iraq', 'India', 'Cyprus', 'India', 'Brazil', 'Pakistan', 'Iraq', 'Cyprus'],
-            'Calling_Stamp': ['2023-01-01 10:00:00', '2023-01-05 11:00:00', '2023-01-10 12:00:00', '2023-01-15 13:00:00', '2023-01-20 14:00:00', '2023-01-25 15:00:00', '2023-01-28 16:00:00', '2023-02-01 17:00:00', '2023-02-05 18:00:00', '2023-02-10 19:00:00', '2023-02-12 20:00:00'],
-            'Signup_Date': ['2023-01-01', '2023-01-05', '2023-01-10', '2023-01-15', '2023-01-20', '2023-01-25', '2023-01-28', '2023-02-01', '2023-02-05', '2023-02-10', '2023-02-12']
-        })
-        df.columns = df.columns.str.strip().str.replace(' ', '_').str.replace('&', 'and').str.lower()
-        if 'first_call_date' in df.columns:
-            df['date_called'] = pd.to_datetime(df['first_call_date'], errors='coerce')
-            df['is_initial_call'] = df['date_called'].notna().astype(int)
-        else:
-            df['date_called'] = pd.NaT
-            df['is_initial_call'] = 0
-            
-        if 'sales_amount' in df.columns:
-            df['sales_amount'] = pd.to_numeric(df['sales_amount'], errors='coerce').fillna(0)
-            
-        if 'status' in df.columns:
-            df['status'] = df['status'].astype(str).str.strip().str.capitalize()
-            df['status'].replace({
-                'Answered call': 'Answered',
-                'Silent call/voicemail': 'Voicemail',
-                'Not answered': 'Not answered',
-                'Invalid number': 'Invalid number'
-            }, inplace=True)    
-
-        if 'sales_status' in df.columns:
-            df['sales_status'] = df['sales_status'].astype(str).str.strip().str.capitalize()
-            sales_status_mapping = {
-                'Sold': 'Converted',
-                'Deal won': 'Converted',
-                'Deal complete': 'Converted',
-                'Lost': 'Not interested',    
-                'No interest': 'Not interested'
-            }
-            df['sales_status'].replace(sales_status_mapping, inplace=True)
-
-        if 'tags' in df.columns:
-            df['issues'] = df['tags'].str.extract(
-                r'(Language Barriers|KYC Issues & Complaints|Bonus or Promotions|Network, Inaudible Conversation|Interested|Spread, Leverage & Platform Concerns|Future Deposit|Withdrawal complaint|Wrong number claim|Busy|Geographical permission needed|VOIP restricted country|Payment method issue|Platform Issue|Answered by Another Person|Explorer|Partners Program)',
-                flags=re.IGNORECASE
-            )
-            df['issues'].fillna('N/A', inplace=True)
-
-        df['call_outcome'] = df['status'].str.extract(
-            r'(Answered|Not answered|Invalid number|Voicemail)',
-            flags=re.IGNORECASE
-        )
-
-        df['country_group'] = np.where(
-            df['country_name'].isin(['India', 'Pakistan', 'Bangladesh']), 'South Asia',
-            np.where(df['country_name'].isin(['Brazil', 'Argentina', 'Colombia']), 'Latin America',
-            np.where(df['country_name'].isin(['Iraq', 'Saudi Arabia', 'United Arab Emirates']), 'Middle East', 'Other'))
-        )
-
-        df['total_follow_up_calls'] = 0
-        follow_up_date_db_columns = [
-            'next_follow_up_date'
-        ]
-        for col_name in follow_up_date_db_columns:
-            if col_name in df.columns:
-                df[col_name] = pd.to_datetime(df[col_name], errors='coerce').dt.date
-                df['total_follow_up_calls'] += df[col_name].notna().astype(int)
-
-        if 'next_follow_up_date' in df.columns:
-            df['next_follow_up_date'] = pd.to_datetime(df['next_follow_up_date'], errors='coerce').dt.date
-            
-        if 'next_follow_up_time' in df.columns:
-            df['next_follow_up_time'] = df['next_follow_up_time'].astype(str).replace('NaT', '').replace('nan', '').str.strip()
-            
-        if 'email' not in df.columns:
-            df['email'] = ''
-        if 'agent' not in df.columns:
-            df['agent'] = 'Unknown'
-
-        df['Calling_Stamp'] = pd.to_datetime(df['Calling_Stamp'], errors='coerce')
-        df['Signup_Date'] = pd.to_datetime(df['Signup_Date'], errors='coerce')
-
-
-if not df.empty:
-    
-    total_unique_agents_in_dataset = df['agent'].loc[df['agent'].astype(bool)].nunique()
-
-    current_user_df = df.copy()
-    
-    if not current_user_df.empty and 'date_called' in current_user_df.columns and not current_user_df['date_called'].isnull().all():
-        data_min_date = current_user_df['date_called'].min().date()
-        data_max_date = current_user_df['date_called'].max().date()
-    else:
-        data_min_date = date(2023, 1, 1)
-        data_max_date = date.today()
-
-    if "agent_filter" not in st.session_state:
-        st.session_state["agent_filter"] = "All"
-    if "country_filter" not in st.session_state:
-        st.session_state["country_filter"] = "All"
-    if "status_filter" not in st.session_state:
-        st.session_state["status_filter"] = "All"
-    
-    # Initialize start_date and end_date in session state, with "Today" option
-    if "start_date" not in st.session_state:
-        st.session_state["start_date"] = data_min_date
-    if "end_date" not in st.session_state:
-        st.session_state["end_date"] = data_max_date
-    
-    def update_start_date():
-        st.session_state["start_date"] = st.session_state["start_date_input"]
-        if st.session_state["start_date"] > st.session_state["end_date"]:
-            st.session_state["end_date"] = st.session_state["start_date"]
-
-    def update_end_date():
-        st.session_state["end_date"] = st.session_state["end_date_input"]
-        if st.session_state["end_date"] < st.session_state["start_date"]:
-            st.session_state["start_date"] = st.session_state["end_date"]
-
-
-    agent_list = ['All'] + sorted(current_user_df['agent'].dropna().unique().tolist())
-    agent_index = agent_list.index(st.session_state['agent_filter']) if st.session_state['agent_filter'] in agent_list else 0
-    agent_filter = st.sidebar.selectbox("Select Agent", agent_list, index=agent_index, key="agent_filter")
-
-    country_list = ['All'] + sorted(current_user_df['country_name'].dropna().unique().tolist())
-    status_list = ['All'] + sorted(current_user_df['status'].dropna().unique().tolist())
-
-    country_index = country_list.index(st.session_state['country_filter']) if st.session_state['country_filter'] in country_list else 0
-    status_index = status_list.index(st.session_state['status_filter']) if st.session_state['status_filter'] in status_list else 0
-
-    country_filter = st.sidebar.selectbox("Select Country", country_list, index=country_index, key="country_filter")
-    status_filter = st.sidebar.selectbox("Select Call Status", status_list, index=status_index, key="status_filter")
-
-    # Add "Today" option for Start Date
-    start_date_options = [data_min_date, date.today()] if data_min_date <= date.today() else [data_min_date]
-    start_date_value = st.session_state["start_date"]
-    
-    if start_date_value == date.today():
-        start_date_index = start_date_options.index(date.today()) if date.today() in start_date_options else 0
-    else:
-        start_date_index = start_date_options.index(start_date_value) if start_date_value in start_date_options else 0
-
-    st.sidebar.date_input(
-        "Start Date",
-        value=start_date_value,
-        min_value=data_min_date,
-        max_value=data_max_date,
-        key="start_date_input",
-        on_change=update_start_date
-    )
-    
-    # Add "Today" option for End Date
-    end_date_options = [data_max_date, date.today()] if data_max_date >= date.today() else [data_max_date]
-    end_date_value = st.session_state["end_date"]
-
-    if end_date_value == date.today():
-        end_date_index = end_date_options.index(date.today()) if date.today() in end_date_options else 0
-    else:
-        end_date_index = end_date_options.index(end_date_value) if end_date_value in end_date_options else 0
-
-    st.sidebar.date_input(
-        "End Date",
-        value=end_date_value,
-        min_value=data_min_date,
-        max_value=data_max_date,
-        key="end_date_input",
-        on_change=update_end_date
-    )
-
-    start_date = st.session_state["start_date"]
-    end_date = st.session_state["end_date"]
-
-
-    filtered_df = current_user_df.copy()
-    if agent_filter != 'All':
-        filtered_df = filtered_df[filtered_df['agent'] == agent_filter]
-    if country_filter != 'All':
-        filtered_df = filtered_df[filtered_df['country_name'] == country_filter]
-    if status_filter != 'All':
-        filtered_df = filtered_df[filtered_df['status'] == status_filter]
-    
-    if 'date_called' in filtered_df.columns:
-        filtered_df['date_called_dt'] = pd.to_datetime(filtered_df['date_called'], errors='coerce')
-        filtered_df = filtered_df[
-            (filtered_df['date_called_dt'].dt.date >= start_date) &
-            (filtered_df['date_called_dt'].dt.date <= end_date)
-        ]
-        filtered_df = filtered_df.drop(columns=['date_called_dt'])
-    else:
-        st.warning("date_called column not found or is empty after filtering. Time-based filters may not work as expected.")
-        filtered_df = pd.DataFrame(columns=df.columns)
-
-    st.markdown("""
-    <style>
-    /* Main tab container - for the overall box */
-    /* This is the div that Streamlit wraps the radio group in */
-    .stRadio > div {
-        background-color: transparent; /* Remove any default background */
-        border-radius: 15px;
-        box-shadow: none; /* Remove default outer shadow */
-        margin-bottom: 1.8rem;
-        /* A subtle border around the entire group of tabs */
-        border: 1px solid rgba(255, 255, 255, 0.1);  
-        padding: 1px; /* Remove internal padding */
-        overflow: hidden; /* Ensures rounded corners clip correctly */
-    }
-    
-    /* Tab group layout - targets the internal div with role="radiogroup" */
-    .stRadio [role="radiogroup"] {
-        display: flex; /* Enable flexbox for horizontal layout */
-        flex-wrap: nowrap; /* <<-- KEY CHANGE: Prevents wrapping to next line */
-        gap: 2px; /* Remove space between individual tabs */
-        padding: 10px; /* Remove padding from the actual radio group */
-        background-color: #262730; /* Dark background for the tab row itself */
-        border-radius: 15px; /* Apply rounded corners to the tab row */
-        overflow: hidden; /* Ensure content is clipped by border-radius */
-    }
-    
-    /* Individual tabs - targets the internal div with role="radio" */
-    .stRadio [role="radio"] {
-        background-color: #262730; /* Default tab background (dark) */
-        border: none; /* Remove individual borders */
-        border-radius: 0px; /* Make them square to connect */
-        padding: 10px 18px; /* Standard padding for each tab */
-        margin: 0; /* No margin between tabs */
-        transition: all 0.2s ease-in-out; /* Smooth transitions for hover/active states */
-        box-shadow: none; /* Remove individual shadow */
-        flex-grow: 1; /* Allows tabs to grow and fill available space evenly */
-        text-align: center; /* Center text within each tab */
-        color: #ccc; /* Lighter text for non-active tabs */
-        font-weight: 400;
-        cursor: pointer; /* Indicate clickable */
-        user-select: none; /* Prevent text selection */
-        display: flex; /* Use flexbox for content alignment */
-        align-items: center;
-        justify-content: center;
-        min-width: 0; /* Allow tabs to shrink as much as needed */
-    }
-    
-    /* Add subtle border between tabs */
-    .stRadio [role="radio"]:not(:last-child) {
-        border-right: 1px solid rgba(255, 255, 255, 0.05); /* Very subtle vertical separator */
-    }
-    
-    /* Hover effect for individual tabs */
-    .stRadio [role="radio"]:hover {
-        background-color: #363740; /* Slightly lighter dark on hover */
-        color: #fff; /* White text on hover */
-    }
-    
-    /* Active tab styling */
-    .stRadio [role="radio"][aria-checked="true"] {
-        background-color: #1a73e8; /* Blue for active tab */
-        color: white;
-        font-weight: 500;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.2); /* More prominent shadow for active tab */
-        position: relative; /* Needed for z-index to bring active tab forward */
-        z-index: 1; /* Bring active tab slightly forward */
-    }
-    
-    /* Hide default radio button circle */
-    .stRadio [role="radio"] > div:first-child {
-        display: none;
-    }
-
-    /* Adjust icon size and margin within tabs */
-    .stRadio [role="radio"] svg {
-        font-size: 1.2em; /* Make icons slightly larger */
-        margin-right: 5px; /* Space between icon and text */
-        flex-shrink: 0; /* Prevent icons from shrinking */
-    }
-
-    /* Target the span containing the text label, allowing it to truncate */
-    .stRadio [role="radio"] span {
-        white-space: nowrap; /* Keep text on one line */
-        overflow: hidden; /* Hide overflowing text */
-        text-overflow: ellipsis; /* Add ellipsis (...) if text overflows */
-    }
-    
-    /* Metric cards - keep previous styling as they are good */
-    .metric-card {
-        background: white;
-        border-radius: 10px;
-        padding: 15px;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-        height: 100%;
-        border: 1px solid #f0f0f0;
-    }
-    .metric-title {
-        font-size: 0.9rem;
-        color: #5f6368;
-        margin-bottom: 8px;
-        font-weight: 500;
-    }
-    .metric-value {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: #202124;
-    }
-    
-    /* Dark mode support */
-    @media (prefers-color-scheme: dark) {
-        .stRadio > div {
-            border: 1px solid #444; /* Darker border for tab group */
-        }
-        .stRadio [role="radio"] {
-            background-color: #2b2b2b; /* Darker background for tabs */
-            color: #aaa;
-        }
-        .stRadio [role="radio"]:not(:last-child) {
-            border-right: 1px solid #444; /* Darker separator */
-        }
-        .stRadio [role="radio"]:hover {
-            background-color: #3b3b3b; /* Darker hover */
-            color: #fff;
-        }
-        .stRadio [role="radio"][aria-checked="true"] {
-            background-color: #0d47a1; /* Darker blue for active tab */
-            color: white;
-            border-color: #0d47a1;
-        }
-        .metric-card {
-            background: #2b2b2b;
-            border-color: #444;
-        }
-        .metric-title {
-            color: #aaa;
-        }
-        .metric-value {
-            color: #fff;
-        }
-    }
-    /* CSS for st.selectbox elements */
-    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] {
-        background-color: #5C6BC0;
-        color: white;
-        border-radius: 12px;
-        font-weight: bold;
-        padding: 5px 10px;
-        margin-top: 20px;
-        border: 1px solid #5C6BC0;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-    }
-    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] div[data-testid="stMuiSelect"] {
-        color: white;
-        font-weight: bold;
-    }
-    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] svg {
-        fill: white;
-    }
-    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"]:hover {
-        background-color: #7986CB;
-        border-color: #7986CB;
-    }
-    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"]:focus-within {
-        border-color: #9FA8DA;
-        box-shadow: 0 0 0 0.2rem rgba(159, 168, 218, 0.25);
-    }
-    /* Dark mode for selectbox */
-    @media (prefers-color-scheme: dark) {
-        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] {
-            background-color: #424242;
-            border-color: #616161;
-        }
-        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"]:hover {
-            background-color: #555;
-            border-color: #757575;
-        }
-        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stMuiSelect"] {
-            color: #fff;
-        }
-        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] svg {
-            fill: #fff;
-        }
-        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"]:focus-within {
-            border-color: #9E9E9E;
-            box-shadow: 0 0 0 0.2rem rgba(158, 158, 158, 0.25);
-        }
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-
-    # Dashboard Metrics Layout
-    st.subheader("📊 Dashboard")
-    
-    if not filtered_df.empty:
-
-        # Calculate total initial calls based on is_initial_call flag
-        total_initial_calls = filtered_df['is_initial_call'].sum()  # Initial Calls
-
-        # Calculate total follow-up calls based on filtered_df and relevant dates
-        total_follow_up_calls_overall = 0
-        follow_up_date_cols_for_counting = [
-            'next_follow_up_date'
-        ]
-        
-         # Use the end_date from the filter for counting follow-up calls
-        filter_end_date = end_date # This is the user-selected end date
-
-        for col_name in follow_up_date_cols_for_counting:
-            if col_name in filtered_df.columns:
-                total_follow_up_calls_overall += (
-                    (filtered_df[col_name].notna()) &
-                    (filtered_df[col_name] <= filter_end_date)
-                ).astype(int).sum() # Count follow-up calls made till the end date
-
-        
-
-        total_calls = total_initial_calls + total_follow_up_calls_overall  # Total Calls Made
-        
-
-        # Total Calls (including answered and non-answered)
-        total_calls_display = f"{total_calls}" if not filtered_df.empty else "0"
-
-        # Calculate total answered calls
-        total_answered_calls = (filtered_df['status'] == 'Answered').sum()
-
-        col1, col2, col3, col4, col5 = st.columns(5)
-
-        def centered_metric(title, value):
-            return f"""
-                <div style='text-align: center; line-height: 1.2;'>
-                    <div style='font-size: 0.9rem; font-weight: 500; margin-bottom: 0.2rem;'>{title}</div>
-                    <div style='font-size: 1.8rem; font-weight: bold;'>{value}</div>
-                </div>
-            """
-            
-        total_entries = len(filtered_df)
-        answered_rate = f"{(filtered_df['status'] == 'Answered').mean() * 100:.1f}%" if not filtered_df.empty else "0.0%"
-        
-        answered_calls_display = f"{total_answered_calls} ({answered_rate})" if not filtered_df.empty else "0 (0.0%)"
-        
-        total_sales = filtered_df['sales_amount'].sum()
-        total_sales_value = f"${total_sales:,.2f}" if not np.isnan(total_sales) else "N/A"
-
-        col1.markdown(centered_metric("Total Calls Made", total_calls_display), unsafe_allow_html=True)
-        col2.markdown(centered_metric("Total Initial Calls", total_initial_calls), unsafe_allow_html=True)
-        col3.markdown(centered_metric("Total Follow-Up Calls Made", total_follow_up_calls_overall), unsafe_allow_html=True)
-        col4.markdown(centered_metric("Answered Calls", answered_calls_display), unsafe_allow_html=True)
-        col5.markdown(centered_metric("Total Sales Generated", total_sales_value), unsafe_allow_html=True)  
-
-    else:
-        st.info("No data available to display dashboard metrics based on current filters.")
-
-
-    tabs = {
-        "home": "📈 Home",
-        "data": "📟 Data Overview",
-        "agent": "👨‍💼 Agent Performance",
-        "country": "🌍 Country Analysis",
-        "call": "📞 Call Outcome",
-        "pipeline": "📈 Sales Pipeline",
-        "followup": "🗓️ Follow Up Calling",
-        "report": "📅 Report Generator"
-    }
-    
-    query_params = st.query_params
-    default_tab_raw = query_params.get("tab", ["home"])[0]
-    
-    if default_tab_raw not in tabs:
-        default_tab = "home"
-    else:
-        default_tab = default_tab_raw
-
-    st.query_params.update(tab=default_tab)
-
-    tab_key = st.radio(
-        "",
-        list(tabs.keys()),
-        format_func=lambda k: tabs[k],
-        index=list(tabs.keys()).index(default_tab),
-        horizontal=True,
-        key="main_tabs_radio"
-    )
-
-    st.query_params.update(tab=tab_key)
-
-
-    if tab_key == "home":
-        with st.container():
-            st.subheader(tabs["home"])
-
-        with st.expander("Sales Distribution by Country"):
-            st.subheader("Sales by Country")
-
-            if not filtered_df.empty:
-                country_sales = filtered_df.groupby('country_name')['sales_amount'].sum().reset_index()
-
-                fig = px.bar(
-                    country_sales,
-                    x='country_name',
-                    y='sales_amount',
-                    color='sales_amount',
-                    labels={'country_name': 'Country', 'sales_amount': 'Sales Amount'},
-                    title="Total Sales by Country",
-                    color_continuous_scale='Blues'
-                )
-
-                fig.update_traces(
-                    hovertemplate='<b>Country:</b> %{x}<br><b>Total Sales:</b> $%{y:,.2f}',
-                    marker_line_width=1.2,
-                    marker_line_color='darkgrey'
-                )
-
-                fig.update_layout(
-                    hoverlabel=dict(
-                        bgcolor="black",
-                        font_size=13,
-                        font_family="Arial",
-                        font_color="white",
-                        bordercolor="lightgray"
-                    ),
-                    xaxis_title="Country",
-                    yaxis_title="Total Sales ($)"
-                )
-
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No sales data available for charts with current filters.")
-
-
-        custom_colors = ["#6D6D6D", "#019C0E", "#27288B", "#C52E00"]
-
-        with st.expander("Call Outcome"):
-            st.subheader("Call Outcomes Pie Chart")
-            if not filtered_df.empty:
-                outcome_counts = filtered_df['call_outcome'].value_counts().reset_index()
-                outcome_counts.columns = ['call_outcome', 'Count']
-
-                fig2 = px.pie(outcome_counts, names='call_outcome', values='Count', hole=0.5, color_discrete_sequence=custom_colors)
-                
-                fig2.update_traces(
-                    textinfo='percent+label',
-                    textfont_size=12,
-                    textfont_color='white',
-                    hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}',
-                    textposition='inside'
-                )
-                
-                st.plotly_chart(fig2, use_container_width=True)
-            else:
-                st.info("No call outcome data available for charts with current filters.")
-
-
-        if 'selected_issue' not in st.session_state:
-            st.session_state.selected_issue = None
-
-        with st.expander("Issues"):
-            st.subheader("Issue Frequency")
-            if not filtered_df.empty:
-                outcome_counts = filtered_df['issues'].value_counts().reset_index()
-                outcome_counts.columns = ['issues', 'Count']
-
-                total_issues = outcome_counts['Count'].sum()
-                display_df = outcome_counts[outcome_counts['issues'] != 'N/A']
-                
-                if not display_df.empty:
-                    display_df['Percentage'] = (display_df['Count'] / total_issues * 100).round(2)
-
-
-                    fig3 = px.bar(
-                        display_df,
-                        x='Count',
-                        y='issues',
-                        color='issues',
-                        orientation='h',
-                        labels={'Count': 'Number of Occurrences', 'issues': 'Issue Type'},
-                    )
-
-                    fig3.update_traces(
-                        hovertemplate="<b>%{y}</b><br>🔢 Count: %{x}<br>📊 Percentage: %{customdata}%<extra></extra>",
-                        customdata=display_df['Percentage']
-                    )
-
-                    fig3.update_layout(
-                        hoverlabel=dict(
-                            bgcolor="black",
-                            font_size=12,
-                            font_family="Arial",
-                            font_color="white"
-                        ),
-                        yaxis={'categoryorder': 'total ascending'},
-                        height=600,
-                        margin=dict(t=30, b=20, l=150, r=20),
-                        xaxis_title='Count',
-                        yaxis_title='Issue Type'
-                    )
-
-                    st.plotly_chart(fig3, use_container_width=False)
-                else:
-                    st.info("No issues (excluding 'N/A') found with current filters.")
-            else:
-                st.info("No data available for issue frequency analysis with current filters.")
-
-            
-        st.subheader("Country by Issue Frequency Search")
-                                                                                                
-        st.markdown("""
-                                                                                                 <style>
-                                                                                                    .stSelectbox [data-testid="stSelectbox"] {
-                                                                                                        background-color: #4CAF50;
-                                                                                                        color: white;
-                                                                                                        border-radius: 12px;
-                                                                                                        font-weight: bold;
-                                                                                                        width: 200px;
-                                                                                                        padding: 5px 10px;
-                                                                                                        margin-top: 20px;
-                                                                                                    }
-
-                                                                                                    .stSelectbox [data-testid="stSelectbox"]:hover {
-                                                                                                        background-color: #45a049;
-                                                                                                    }
-
-                                                                                                    .stSelectbox div[role="listbox"] {
-                                                                                                        background-color: #f1f1f1;
-                                                                                                        color: black;
-                                                                                                        border-radius: 12px;
-                                                                                                    }
-
-                                                                                                    .stSelectbox li:hover {
-                                                                                                        background-color: #ddd;
-                                                                                                        color: black;
-                                                                                                    }
-
-                                                                                                    .stSelectbox select:focus {
-                                                                                                        outline: none;
-                                                                                                    }
-                                                                                                 </style>
-                                                                                                 """, unsafe_allow_html=True)
-
-        if not filtered_df.empty and 'issues' in filtered_df.columns:
-            available_issues = display_df['issues'].tolist() if not display_df.empty else []
-            if available_issues:
-                selected_issue = st.selectbox(
-                                                "Select an Issue to see",
-                                                available_issues,
-                                                index=0 if st.session_state.selected_issue not in available_issues else available_issues.index(st.session_state.selected_issue),
-                                                key="issue_selectbox"
-                                            )
-
-                st.session_state.selected_issue = selected_issue
-
-                issue_data = filtered_df[filtered_df['issues'] == selected_issue]
-
-                if not issue_data.empty:
-                    country_issue_counts = issue_data['country_name'].value_counts().reset_index()
-                    country_issue_counts.columns = ['Country', 'Count']
-                                                                    
-                    st.subheader(f"Countries with '{selected_issue}' issue")
-                    st.dataframe(country_issue_counts)
-                else:
-                    st.warning(f"No data available for '{selected_issue}' issue.")    
-            else:
-                st.info("No issues found in the filtered data to select.")
-        else:
-            st.info("No data available for issue frequency search with current filters.")
-
-
-    elif tab_key == "data":
-        with st.container():
-            st.subheader(tabs["data"])
-
-        with st.expander("Filtered Raw Data"):
-            st.subheader("Filtered Raw Data")
-            if not filtered_df.empty:
-                st.dataframe(filtered_df)
-            else:
-                st.info("No data found matching the selected filters.")
-        
-
-    elif tab_key == "agent":
-        with st.container():
-            st.subheader(tabs["agent"])
-            
-            if not filtered_df.empty:
-                agent_stats = filtered_df.groupby('agent').agg(
-                    Total_Initial_Calls=('is_initial_call', 'sum'),
-                    Total_Follow_Up_Calls=('total_follow_up_calls', 'sum'),
-                    Total_Answered_Calls=('status', lambda x: (x == 'Answered').sum()),
-                    Answered_Rate=('status', lambda x: (x == 'Answered').mean() * 100),
-                    Sales_Follow_Up_Rate=('sales_status', lambda x: (x == 'Follow up').mean() * 100),
-                    Total_Sales=('sales_amount', 'sum'),
-                    
-                )
-                agent_stats.columns = ['Total_Initial_Calls', 'Total_Follow_Up_Calls', 'Total_Answered_Calls', 'Answered_Rate', 'Sales_Follow_Up_Rate', 'Total_Sales']
-                agent_stats = agent_stats.sort_values('Total_Initial_Calls', ascending=False)
-
-                agent_stats = agent_stats.reset_index()
-                agent_stats = agent_stats[agent_stats['agent'].str.strip().astype(bool)]
-                valid_agents = sorted(agent_stats['agent'].tolist())
-                
-                st.markdown("""
-                    <style>
-                        .stSelectbox [data-testid="stSelectbox"] {
-                            background-color: #4CAF50;
-                            color: white;
-                            border-radius: 12px;
-                            font-weight: bold;
-                            width: 200px;
-                            padding: 5px 10px;
-                            margin-top: 20px;
-                        }
-
-                        .stSelectbox [data-testid="stSelectbox"]:hover {
-                            background-color: #45a049;
-                        }
-
-                        .stSelectbox div[role="listbox"] {
-                            background-color: #f1f1f1;
-                            color: black;
-                            border-radius: 12px;
-                        }
-
-                        .stSelectbox li:hover {
-                            background-color: #ddd;
-                            color: black;
-                        }
-
-                        .stSelectbox select:focus {
-                            outline: none;
-                        }
-                    </style>
-                    """, unsafe_allow_html=True)
-
-                st.subheader("Agent Performance Visualizations")
-
-                agent_view_option = st.radio(
-                    "Select Agent View:",
-                    ["Top 5 Agents", "All Agents", "Individual Agent"],  
-                    horizontal=True,
-                    key="agent_view_radio"
-                )
-
-                if agent_view_option == "Individual Agent":
-                    if valid_agents:
-                        selected_agent = st.selectbox(
-                            "Select an Agent",
-                            valid_agents,
-                            index=0,
-                            key="selected_agent_selectbox"
-                        )
-
-                        agent_df = filtered_df[filtered_df['agent'] == selected_agent]
-                        total_initial_calls_agent = agent_df['is_initial_call'].sum()  
-                        total_follow_up_calls_agent = agent_df['total_follow_up_calls'].sum()
-                        total_answered_calls_agent = (agent_df['status'] == 'Answered').sum()
-
-                        if agent_df.empty:
-                            st.warning(f"No data available for {selected_agent}.")
-                        else:
-                            st.subheader(f"📊 {selected_agent}'s Performance")
-                            
-                            col1, col2, col3, col4, col5 = st.columns(5)
-                            
-                            call_outcomes = agent_df['status'].value_counts().reindex(
-                                ['Answered', 'Not answered', 'Voicemail', 'Invalid number'],
-                                fill_value=0
-                            )
-
-                            with col1:
-                                st.metric("📞 Initial Calls", f"{total_initial_calls_agent}")  
-                            with col2:  
-                                st.metric("🔄 Follow-Up Calls", f"{total_follow_up_calls_agent}")
-                            with col3:
-                                st.metric("✅ Answered Calls", f"{total_answered_calls_agent} ({((agent_df['status'] == 'Answered').mean() * 100):.1f}%)")
-                            with col4:
-                                st.metric("📈 Sales Follow Up Rate",
-                                            f"{(agent_df['sales_status'] == 'Follow up').mean() * 100:.1f}%" if total_initial_calls_agent > 0 else "0.0%")  
-                            with col5:
-                                st.metric("💰 Total Sales",    
-                                            f"${agent_df['sales_amount'].sum():,.2f}")  
-                            
-                            st.markdown(f"**Detailed Breakdown for {selected_agent}:**")
-
-                            call_outcome_colors = {
-                                'Answered': 'green',
-                                'Not answered': 'gray',
-                                'Invalid number': 'red',
-                                'Voicemail': 'blue'
-                            }
-
-                            fig_call = px.pie(
-                                call_outcomes,
-                                names=call_outcomes.index,
-                                values=call_outcomes.values,
-                                title=f"{selected_agent} - Call Outcome Distribution",
-                                hole=0.4,
-                                color=call_outcomes.index,
-                                color_discrete_map=call_outcome_colors
-                            )
-                            fig_call.update_traces(
-                                hovertemplate="<b>%{label}</b><br>Calls: %{value}<br>Share: %{percent:.2f}%",
-                                textinfo='percent+label',
-                                texttemplate='%{percent:.0%}' if '%{percent}' != '0%' else '',
-                                textposition='inside'
-                            )
-                            st.plotly_chart(fig_call, use_container_width=True)
-
-                            sales_status_colors = {
-                                'Follow up': 'purple',
-                                'Not interested': 'red',
-                                'Converted': 'green'
-                            }
-                            sales_dist = agent_df['sales_status'].value_counts().reindex(['Follow up', 'Not interested', 'Converted'], fill_value=0)
-                            fig_sales = px.pie(
-                                sales_dist,
-                                names=sales_dist.index,
-                                values=sales_dist.values,
-                                title=f"{selected_agent} - Sales Status Distribution",
-                                hole=0.4,
-                                color=sales_dist.index,
-                                color_discrete_map=sales_status_colors
-                            )
-                            fig_sales.update_traces(
-                                hovertemplate="<b>%{label}</b><br>Calls: %{value}<br>Share: %{percent:.2f}%",
-                                textinfo='percent+label',
-                                texttemplate='%{percent:.0%}' if '%{percent}' != '0%' else '',
-                                textposition='inside'
-                            )
-                            st.plotly_chart(fig_sales, use_container_width=True)
-                    else:
-                        st.info("No agents found in the filtered data to display individual performance.")
-
-                else:
-                    if agent_view_option == "Top 5 Agents":
-                        selected_agents = agent_stats.head(5)
-                        view_title_prefix = "Top 5 "
-                    else:
-                        selected_agents = agent_stats
-                        view_title_prefix = "All "
-
-                    fig_initial_calls = px.bar(
-                        selected_agents,
-                        x='agent',
-                        y='Total_Initial_Calls',
-                        title=f'{view_title_prefix}Agents by Total Initial Call Volume',
-                        labels={'Total_Initial_Calls': 'Total Initial Calls', 'agent': 'Agent'},
-                        color='agent',
-                        color_discrete_sequence=px.colors.qualitative.Plotly
-                    )
-                    fig_initial_calls.update_traces(
-                        hovertemplate="<b>Agent:</b> %{x}<br><b>Total Initial Calls:</b> %{y}<extra></extra>"
-                    )
-                    fig_initial_calls.update_layout(showlegend=False)
-                    st.plotly_chart(fig_initial_calls, use_container_width=True)
-                    
-                    fig_follow_up = px.bar(
-                        selected_agents,
-                        x='agent',
-                        y='Total_Follow_Up_Calls',
-                        title=f'{view_title_prefix}Agents by Total Follow-Up Call Volume',
-                        labels={'Total_Follow_Up_Calls': 'Total Follow-Up Calls', 'agent': 'Agent'},
-                        color='agent',
-                        color_discrete_sequence=px.colors.qualitative.Safe
-                    )
-                    fig_follow_up.update_traces(
-                        hovertemplate="<b>Agent:</b> %{x}<br><b>Total Follow-Up Calls:</b> %{y}<extra></extra>"
-                    )
-                    fig_follow_up.update_layout(showlegend=False)
-                    st.plotly_chart(fig_follow_up, use_container_width=True)
-
-                    fig_answered_calls = px.bar(
-                        selected_agents,
-                        x='agent',
-                        y='Total_Answered_Calls',
-                        title=f'{view_title_prefix}Agents by Total Answered Calls',
-                        labels={'Total_Answered_Calls': 'Total Answered Calls', 'agent': 'Agent'},
-                        color='agent',
-                        color_discrete_sequence=px.colors.qualitative.Plotly
-                    )
-                    fig_answered_calls.update_traces(
-                        hovertemplate="<b>Agent:</b> %{x}<br><b>Total Answered Calls:</b> %{y}<extra></extra>"
-                    )
-                    fig_answered_calls.update_layout(showlegend=False)
-                    st.plotly_chart(fig_answered_calls, use_container_width=True)
-
-
-                    fig2 = px.bar(
-                        selected_agents,
-                        x='agent',
-                        y='Answered_Rate',
-                        title=f'{view_title_prefix}Agents by Answered Rate',
-                        labels={'Answered_Rate': 'Answered Rate (%)', 'agent': 'Agent'},
-                        color='agent',
-                        color_discrete_sequence=px.colors.qualitative.Plotly
-                    )
-                    fig2.update_traces(
-                        hovertemplate="<b>Agent:</b> %{x}<br><b>Answered Rate:</b> %{y:.1f}%<extra></extra>"
-                    )
-                    fig2.update_layout(showlegend=False, yaxis_range=[0, 100])
-                    st.plotly_chart(fig2, use_container_width=True)
-
-                    fig3 = px.bar(
-                        selected_agents,
-                        x='agent',
-                        y='Sales_Follow_Up_Rate',  
-                        title=f'{view_title_prefix}Agents by Sales Follow Up Rate (from Initial Calls)',
-                        labels={'Sales_Follow_Up_Rate': 'Sales Follow Up Rate (%)', 'agent': 'Agent'},  
-                        color='agent',
-                        color_discrete_sequence=px.colors.qualitative.Plotly
-                    )
-                    fig3.update_traces(
-                        hovertemplate="<b>Agent:</b> %{x}<br><b>Sales Follow-Up Rate:</b> %{y:.1f}%<extra></extra>"
-                    )
-                    fig3.update_layout(showlegend=False, yaxis_range=[0, 100])
-                    st.plotly_chart(fig3, use_container_width=True)
-
-                    fig4 = px.bar(
-                        selected_agents,
-                        x='agent',
-                        y='Total_Sales',
-                        title=f'{view_title_prefix}Agents by Total Sales',
-                        labels={'Total_Sales': 'Total Sales ($)', 'agent': 'Agent'},
-                        color='agent',
-                        color_discrete_sequence=px.colors.qualitative.Plotly
-                    )
-                    fig4.update_traces(
-                        hovertemplate="<b>Agent:</b> %{x}<br><b>Total Sales:</b> $%{y:,.2f}<extra></extra>"
-                    )
-                    fig4.update_layout(showlegend=False)
-                    st.plotly_chart(fig4, use_container_width=True)
-
-                    st.markdown("### Performance Metrics Summary")
-                    if not selected_agents.empty:
-                        st.markdown(f"- **Highest Initial Call Volume:** {selected_agents.nlargest(1, 'Total_Initial_Calls').iloc[0]['agent']} ({selected_agents.nlargest(1, 'Total_Initial_Calls').iloc[0]['Total_Initial_Calls']} calls)")  
-                        st.markdown(f"- **Highest Follow-Up Call Volume:** {selected_agents.nlargest(1, 'Total_Follow_Up_Calls').iloc[0]['agent']} ({selected_agents.nlargest(1, 'Total_Follow_Up_Calls').iloc[0]['Total_Follow_Up_Calls']} calls)")
-                        st.markdown(f"- **Highest Answered Calls:** {selected_agents.nlargest(1, 'Total_Answered_Calls').iloc[0]['agent']} ({selected_agents.nlargest(1, 'Total_Answered_Calls').iloc[0]['Total_Answered_Calls']} calls)")
-                        st.markdown(f"- **Best Answered Rate:** {selected_agents.nlargest(1, 'Answered_Rate').iloc[0]['agent']} ({selected_agents.nlargest(1, 'Answered_Rate').iloc[0]['Answered_Rate']:.1f}%)")
-                        st.markdown(f"- **Top Sales Performer:** {selected_agents.nlargest(1, 'Total_Sales').iloc[0]['agent']} (${selected_agents.nlargest(1, 'Total_Sales').iloc[0]['Total_Sales']:,.2f})")
-                    else:
-                        st.info("No agent data to display summaries.")
-            else:
-                st.info("No data available for agent performance analysis with current filters.")
-        
-        
-    elif tab_key == "country":
-        with st.container():
-            st.subheader(tabs["country"])
-
-            analysis_type = st.radio("Select Analysis Type", ["Overall Analysis", "Individual Country Analysis"], horizontal=True, key="country_analysis_radio")
-
-            country_stats = filtered_df.groupby('country_name').agg(
-                Total_Initial_Calls=('is_initial_call', 'sum'),
-                Total_Follow_Up_Calls=('total_follow_up_calls', 'sum'),
-                Total_Answered_Calls=('status', lambda x: (x == 'Answered').sum()),
-                Answered_Rate=('status', lambda x: (x == 'Answered').mean() * 100),
-                Sales_Follow_Up_Rate=('sales_status', lambda x: (x == 'Follow up').mean() * 100),
-                Total_Sales=('sales_amount', 'sum'),
-                Avg_Sale=('sales_amount', 'mean')
-            )
-            country_stats.columns = ['Total_Initial_Calls', 'Total_Follow_Up_Calls', 'Total_Answered_Calls', 'Answered_Rate', 'Sales_Follow_Up_Rate', 'Total_Sales', 'Avg_Sale']
-            country_stats = country_stats.sort_values('Total_Initial_Calls', ascending=False)
-
-
-            if analysis_type == "Overall Analysis":
-                st.markdown("### Overall Country Performance")
-                
-                # Chart for Total Initial Calls
-                top_initial_calls_countries = country_stats.head(10).sort_values('Total_Initial_Calls')
-                fig_initial_calls_country = px.bar(
-                    top_initial_calls_countries,
-                    x='Total_Initial_Calls',
-                    y=top_initial_calls_countries.index,
-                    orientation='h',
-                    title="Top 10 Countries by Total Initial Call Volume",
-                    color='Total_Initial_Calls',
-                    color_continuous_scale='Blues'
-                )
-                fig_initial_calls_country.update_traces(hovertemplate='<b>%{y}</b><br>Total Initial Calls: %{x}')
-                fig_initial_calls_country.update_layout(xaxis_title='Total Initial Calls', yaxis_title='Country')
-                st.plotly_chart(fig_initial_calls_country, use_container_width=True)
-
-                # Chart for Total Follow-Up Calls by Country
-                top_follow_ups = country_stats.nlargest(10, 'Total_Follow_Up_Calls').sort_values('Total_Follow_Up_Calls')
-                fig_country_follow_up = px.bar(
-                    top_follow_ups,
-                    x='Total_Follow_Up_Calls',
-                    y=top_follow_ups.index,
-                    orientation='h',
-                    title="Top 10 Countries by Total Follow-Up Call Volume",
-                    color='Total_Follow_Up_Calls',
-                    color_continuous_scale='Purples'
-                )
-                fig_country_follow_up.update_traces(hovertemplate='<b>%{y}</b><br>Total Follow-Up Calls: %{x}')
-                fig_country_follow_up.update_layout(xaxis_title='Total Follow-Up Calls', yaxis_title='Country')
-                st.plotly_chart(fig_country_follow_up, use_container_width=True)
-
-                # Chart for Total Answered Calls by Country
-                top_answered_calls_countries = country_stats.nlargest(10, 'Total_Answered_Calls').sort_values('Total_Answered_Calls')
-                fig_answered_calls_country = px.bar(
-                    top_answered_calls_countries,
-                    x='Total_Answered_Calls',
-                    y=top_answered_calls_countries.index,
-                    orientation='h',
-                    title="Top 10 Countries by Total Answered Calls",
-                    color='Total_Answered_Calls',
-                    color_continuous_scale='Greens'
-                )
-                fig_answered_calls_country.update_traces(hovertemplate='<b>%{y}</b><br>Total Answered Calls: %{x}')
-                fig_answered_calls_country.update_layout(xaxis_title='Total Answered Calls', yaxis_title='Country')
-                st.plotly_chart(fig_answered_calls_country, use_container_width=True)
-
-
-                answered_top = country_stats[country_stats['Total_Initial_Calls'] > 0].sort_values('Answered_Rate', ascending=False).head(10)
-                fig_answered_top = px.bar(
-                    answered_top.sort_values('Answered_Rate'),
-                    x='Answered_Rate',
-                    y=answered_top.sort_values('Answered_Rate').index,
-                    orientation='h',
-                    title="Top 10 Countries by Answered Rate",
-                    color='Answered_Rate',
-                    color_continuous_scale='Greens'
-                )
-                fig_answered_top.update_traces(hovertemplate='<b>%{y}</b><br>Answered Rate: %{x:.2f}%')
-                fig_answered_top.update_layout(xaxis_title='Answered Rate', yaxis_title='Country')
-                st.plotly_chart(fig_answered_top, use_container_width=True)
-
-                answered_sorted = country_stats.sort_values('Answered_Rate', ascending=False)
-                fig4 = px.bar(
-                    answered_sorted,
-                    x='Answered_Rate',
-                    y=answered_sorted.index,
-                    orientation='h',
-                    title="All Countries by Answered Rate",
-                    color='Answered_Rate',
-                    color_continuous_scale='Greens'
-                )
-                fig4.update_traces(
-                    hovertemplate='<b>%{y}</b><br>Answered Rate: %{x:.2f}%'
-                )
-                fig4.update_layout(xaxis_title='Answered Rate', yaxis_title='Country')
-                st.plotly_chart(fig4, use_container_width=True)
-
-                top_sales = country_stats.sort_values('Total_Sales', ascending=False).head(10)
-                fig3 = px.bar(
-                    top_sales.sort_values('Total_Sales'),
-                    x='Total_Sales',
-                    y=top_sales.sort_values('Total_Sales').index,
-                    orientation='h',
-                    title="Top 10 Countries by Total Sales",
-                    color='Total_Sales',
-                    color_continuous_scale='Reds'
-                )
-                fig3.update_traces(hovertemplate='<b>%{y}</b><br>Total Sales: $%{x:,.2f}')
-                fig3.update_layout(xaxis_title='Total Sales', yaxis_title='Country')
-                st.plotly_chart(fig3, use_container_width=True)
-
-                sales_sorted = country_stats.sort_values('Total_Sales', ascending=False)
-                fig6 = px.bar(
-                    sales_sorted,
-                    x='Total_Sales',
-                    y=sales_sorted.index,
-                    orientation='h',
-                    title="All Countries by Total Sales",
-                    color='Total_Sales',
-                    color_continuous_scale='Reds'
-                )
-                fig6.update_traces(
-                    hovertemplate='<b>%{y}</b><br>Total Sales: $%{x:,.2f}'
-                )
-                fig6.update_layout(xaxis_title='Total Sales', yaxis_title='Country')
-                st.plotly_chart(fig6, use_container_width=True)
-
-
-            elif analysis_type == "Individual Country Analysis":
-                country_list = country_stats.index.tolist()
-                if country_list:
-                    selected_country = st.selectbox("Select a Country", country_list, key="selected_country_selectbox")
-
-                    if selected_country in country_stats.index:
-                        country_data = country_stats.loc[selected_country]
-                        
-                        st.markdown(f"### Performance for **{selected_country}**")
-                        
-                        total_initial_calls_country = int(country_data['Total_Initial_Calls'])
-                        total_follow_up_calls_country = int(country_data['Total_Follow_Up_Calls'])
-                        total_answered_calls_country = int(country_data['Total_Answered_Calls'])
-                        answered_rate_country = float(country_data['Answered_Rate'])
-                        sales_follow_up_rate_country = float(country_data['Sales_Follow_Up_Rate'])  
-                        total_sales_country = float(country_data['Total_Sales'])
-                        avg_sale_country = float(country_data['Avg_Sale'])
-                                                                        
-                        col1, col2, col3, col4, col5 = st.columns(5)
-                        with col1:
-                            st.metric("Total Initial Calls", total_initial_calls_country)
-                        with col2:  
-                            st.metric("Total Follow-Up Calls", total_follow_up_calls_country)
-                        with col3:
-                            st.metric("Answered Calls", f"{total_answered_calls_country} ({answered_rate_country:.1f}%)")
-                        with col4:
-                            st.metric("Sales Follow Up Rate", f"{sales_follow_up_rate_country:.1f}%")  
-                        with col5:
-                            st.metric("Total Sales", f"${total_sales_country:,.2f}")  
-                        
-                        country_call_dist = filtered_df[filtered_df['country_name'] == selected_country]['status'].value_counts().reindex(['Answered', 'Not answered', 'Voicemail', 'Invalid number'], fill_value=0)
-                        country_call_dist = country_call_dist[country_call_dist > 0]
-                        call_outcome_colors = {
-                            'Answered': 'green',
-                            'Not answered': 'gray',
-                            'Invalid number': 'red',
-                            'Voicemail': 'blue'
-                        }
-
-                        fig_call = px.pie(
-                            country_call_dist,
-                            names=country_call_dist.index,
-                            values=country_call_dist.values,
-                            title=f"{selected_country} - Call Outcome",
-                            hole=0.4,
-                            color=country_call_dist.index,
-                            color_discrete_map=call_outcome_colors
-                        )
-                        fig_call.update_traces(
-                            hovertemplate="<b>%{label}</b><br>Calls: %{value}<br>Share: %{percent:.2f}%",
-                            textinfo='percent+label',
-                            texttemplate='%{percent:.0%}' if '%{percent}' != '0%' else '',
-                            textposition='inside'
-                        )
-                        st.plotly_chart(fig_call, use_container_width=True)
-
-                        country_sales_df_filtered = filtered_df[filtered_df['country_name'] == selected_country].copy()
-                        country_sales_df_filtered['sales_status'] = country_sales_df_filtered['sales_status'].astype(str).str.strip()
-                        country_sales_df_filtered['sales_status'].replace('', np.nan, inplace=True)
-                        country_sales_df_filtered.dropna(subset=['sales_status'], inplace=True)
-
-                        valid_sales_statuses_country = country_sales_df_filtered['sales_status'].dropna().unique().tolist()
-                        country_sales_dist = country_sales_df_filtered['sales_status'].value_counts().reindex(valid_sales_statuses_country, fill_value=0)
-                        
-                        sales_status_colors = {
-                            'Follow up': 'purple',
-                            'Not interested': 'red',
-                            'Converted': 'green'
-                        }
-                        color_scale = px.colors.qualitative.Plotly
-                        dynamic_sales_colors = {status: sales_status_colors.get(status, color_scale[i % len(color_scale)]) for i, status in enumerate(valid_sales_statuses_country)}
-
-
-                        fig_sales = px.pie(
-                            country_sales_dist,
-                            names=country_sales_dist.index,
-                            values=country_sales_dist.values,
-                            title=f"{selected_country} - Sales Status",
-                            hole=0.4,
-                            color=country_sales_dist.index,
-                            color_discrete_map=dynamic_sales_colors
-                        )
-                        fig_sales.update_traces(
-                            hovertemplate="<b>%{label}</b><br>Leads: %{value}<br>Share: %{percent:.2f}%",
-                            textinfo='percent+label',
-                            texttemplate='%{percent:.0%}' if '%{percent}' != '0%' else '',
-                            textposition='inside'
-                        )
-                        st.plotly_chart(fig_sales, use_container_width=True)
-
-                    else:
-                        st.warning(f"No data available for {selected_country}.")
-                else:
-                    st.info("No countries found in the filtered data to analyze.")
-            else:
-                st.info("No data available for country analysis with current filters.")
-        
-    elif tab_key == "call":
-        with st.container():
-            st.subheader(tabs["call"])
-
-            if not filtered_df.empty:
-                valid_outcomes = ['Answered', 'Not answered', 'Voicemail', 'Invalid number']
-                color_map = {
-                    'Answered': 'green',
-                    'Not answered': 'gray',
-                    'Voicemail': 'blue',
-                    'Invalid number': 'red'
-                }
-
-                call_outcome_df_temp = filtered_df.copy()
-                call_outcome_df_temp['call_outcome'] = call_outcome_df_temp['status'].str.extract(
-                    r'(Answered|Not answered|Voicemail|Invalid number)', flags=re.IGNORECASE
-                )
-                call_outcome_df_temp['call_outcome'].fillna('Other', inplace=True)
-                call_outcome_df_temp = call_outcome_df_temp[call_outcome_df_temp['call_outcome'].isin(valid_outcomes)]
-                
-                if not call_outcome_df_temp.empty:
-                    outcome_dist = call_outcome_df_temp['call_outcome'].value_counts(normalize=True) * 100
-                    outcome_dist = outcome_dist.sort_values(ascending=False).round(1)
-
-                    outcome_df = outcome_dist.reset_index()
-                    outcome_df.columns = ['call_outcome', 'Percentage']
-
-                    fig = px.bar(
-                        outcome_df,
-                        x='call_outcome',
-                        y='Percentage',
-                        title="Call Outcome Distribution by Status",
-                        color='call_outcome',
-                        color_discrete_map=color_map,
-                        text=outcome_df['Percentage'].astype(str) + '%'
-                    )
-                    fig.update_traces(
-                        textposition='outside',
-                        hovertemplate='<b>Outcome:</b> %{x}<br><b>Percentage:</b> %{y:.1f}%<extra></extra>'
-                    )
-                    fig.update_layout(
-                        yaxis_title="Percentage (%)",
-                        xaxis_title="Call Outcome",
-                        hoverlabel=dict(
-                            bgcolor="black",
-                            font_size=12,
-                            font_family="Arial",
-                            font_color="white",
-                            bordercolor="lightgray"
-                        )
-                    )
-
-                    st.plotly_chart(fig, use_container_width=True)
-
-                    fig2 = px.pie(
-                        outcome_df,
-                        names='call_outcome',
-                        values='Percentage',
-                        title="Call Outcome Distribution by Status (Donut Chart)",
-                        hole=0.4,
-                        color='call_outcome',
-                        color_discrete_map=color_map
-                    )
-                    fig2.update_traces(
-                        hovertemplate='<b>%{label}</b><br><b>Percentage:</b> %{percent}',
-                        textinfo='percent+label',
-                        text=outcome_dist.round(1).astype(str) + '%'
-                    )
-
-                    fig2.update_layout(
-                        hoverlabel=dict(
-                            bgcolor="black",
-                            font_size=12,
-                            font_family="Arial",
-                            font_color="white",
-                            bordercolor="lightgray"
-                        )
-                    )
-
-                    st.plotly_chart(fig2, use_container_width=True)
-                else:
-                    st.info("No valid call outcome data found with current filters.")
-
-
-    elif tab_key == "pipeline":
-        with st.container():
-            st.subheader(tabs["pipeline"])
-            
-            answered_df = filtered_df[filtered_df['status'].str.strip() == 'Answered'].copy()
-
-            answered_df['sales_status'] = answered_df['sales_status'].astype(str).str.strip()
-            # Exclude 'nan' or empty string sales_status values
-            answered_df = answered_df[answered_df['sales_status'].notna() & (answered_df['sales_status'] != '') & (answered_df['sales_status'].str.lower() != 'nan')]
-
-            answered_df['sales_amount'] = pd.to_numeric(answered_df['sales_amount'], errors='coerce').fillna(0)
-
-            valid_sales_statuses_pipeline = answered_df['sales_status'].dropna().unique().tolist()
-
-            preferred_order = ['Not interested', 'Follow up', 'Converted']
-
-            final_valid_statuses_pipeline = [s for s in preferred_order if s in valid_sales_statuses_pipeline] + \
-                                            [s for s in valid_sales_statuses_pipeline if s not in preferred_order]
-
-            answered_df = answered_df[answered_df['sales_status'].isin(final_valid_statuses_pipeline)]
-
-            if not answered_df.empty:
-                pipeline_dist = answered_df['sales_status'].value_counts()
-                pipeline_dist.fillna(0, inplace=True)  
-                
-                color_scale_pipeline = px.colors.qualitative.Plotly
-                color_map_pipeline = {status: color_scale_pipeline[i % len(color_scale_pipeline)] for i, status in enumerate(final_valid_statuses_pipeline)}
-                color_map_pipeline.update({
-                    'Not interested': 'red',
-                    'Converted': 'green',
-                    'Follow up': 'purple'
-                })
-
-                # Filter out 'nan' values from display_df_pipeline to ensure they don't appear in charts
-                display_df_pipeline = answered_df[answered_df['sales_status'].notna() & (answered_df['sales_status'] != '')]
-
-                fig1 = px.pie(
-                    pipeline_dist,
-                    names=pipeline_dist.index,
-                    values=pipeline_dist.values,
-                    title="Sales Pipeline Distribution (Overall)",
-                    hole=0.4,
-                    color=pipeline_dist.index,
-                    color_discrete_map=color_map_pipeline
-                )
-                fig1.update_traces(
-                    hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}',
-                    textinfo='label+percent'
-                )
-                st.plotly_chart(fig1, use_container_width=True)
-
-                st.markdown("### Key Sales Pipeline Rates:")
-                
-                st.markdown("---")
-
-                view_option = st.radio("Select Country View", ["Top 5 Countries", "All Countries"], horizontal=True, key="pipeline_country_view_radio")  
-
-                country_df_pipeline = answered_df.copy()
-
-                if not country_df_pipeline.empty:
-                    country_df_pipeline.dropna(subset=['country_name'], inplace=True)
-                    
-                    cross = pd.crosstab(
-                        country_df_pipeline['country_name'],
-                        country_df_pipeline['sales_status'],
-                        normalize='index'
-                    ).mul(100).round(1)
-
-                    for status in final_valid_statuses_pipeline:
-                        if status not in cross.columns:
-                            cross[status] = 0
-
-                    cross = cross[final_valid_statuses_pipeline]
-                    
-                    cross.fillna(0, inplace=True)
-
-                    if view_option == "Top 5 Countries":
-                        cross_display = cross.nlargest(5, 'Converted')
-                        view_title_suffix = " (Top 5 Converting Countries)"
-                    else:
-                        cross_display = cross
-                        view_title_suffix = ""
-
-                    fig2 = px.bar(
-                        cross_display.reset_index(),
-                        x='country_name',
-                        y=final_valid_statuses_pipeline,
-                        title=f"Sales Status Distribution by Country{view_title_suffix}",
-                        labels={'country_name': 'Country', 'value': 'Percentage (%)', 'variable': 'Sales Status'},
-                        color_discrete_map=color_map_pipeline,
-                        barmode='stack'
-                    )
-
-                    fig2.update_traces(
-                        hovertemplate='<b>%{x}</b><br>' +
-                                        '%{fullData.name}: <b>%{y:.1f}%</b><extra></extra>'
-                    )
-                    
-                    fig2.update_layout(
-                        xaxis=dict(title='Country'),
-                        legend_title='Sales Status',
-                        hovermode='closest',
-                        hoverlabel=dict(
-                            bgcolor="black",
-                            font_size=13,
-                            font_family="Arial",
-                            font_color="white",
-                            bordercolor="lightgray"
-                        )
-                    )
-                    st.plotly_chart(fig2, use_container_width=True)
-                else:
-                    st.info("No 'Answered' calls with valid sales statuses found for the selected filters to display the pipeline analysis.")
-            else:
-                st.info("No 'Answered' calls found for the selected filters to display the pipeline analysis.")
-
-
-    
-    elif tab_key == "followup":  
-        with st.container():
-            st.subheader(tabs["followup"])
-
-            st.markdown("---")
-            st.markdown("### 📊 Follow-Up Call Counts by Agent")
-
-            if not filtered_df.empty:
-                # Ensure 'agent' and 'total_follow_up_calls' columns are used consistently
-                # 'total_follow_up_calls' is calculated in load_full_sales_data_from_db to include 2nd-10th calls
-                agent_follow_up_counts = filtered_df.groupby('agent')['total_follow_up_calls'].sum().reset_index()
-                
-                # Filter out agents with empty names or 0 follow-up calls if desired
-                agent_follow_up_counts = agent_follow_up_counts[
-                    (agent_follow_up_counts['agent'].str.strip().astype(bool)) &
-                    (agent_follow_up_counts['total_follow_up_calls'] > 0) # Only show agents who actually have follow-up calls
-                ]
-                agent_follow_up_counts = agent_follow_up_counts.sort_values(by='total_follow_up_calls', ascending=False)
-
-                if not agent_follow_up_counts.empty:
-                    fig_agent_follow_ups = px.bar(
-                        agent_follow_up_counts,
-                        x='agent',
-                        y='total_follow_up_calls',
-                        title='Total Follow-Up Calls by Agent',
-                        labels={'total_follow_up_calls': 'Number of Follow-Up Calls', 'agent': 'Agent'},
-                        color='total_follow_up_calls',
-                        color_continuous_scale='Purples'
-                    )
-                    fig_agent_follow_ups.update_traces(hovertemplate="<b>Agent:</b> %{x}<br><b>Follow-Up Calls:</b> %{y}<extra></extra>")
-                    fig_agent_follow_ups.update_layout(xaxis_title='Agent', yaxis_title='Total Follow-Up_Calls')
-                    st.plotly_chart(fig_agent_follow_ups, use_container_width=True)
-                else:
-                    st.info("No agents found with recorded follow-up calls in the filtered data.")
-            else:
-                st.info("No data available for follow-up call counting.")
-            
-            st.markdown("---")
-            
-            analysis_reference_date = end_date
-
-            # --- Section 1: Upcoming Follow-Up Calls (based on next_follow_up_date) ---
-            st.markdown("### 🗓️ Upcoming Follow-Up Calls")
-            
-            # Filter for rows that have a future 'next_follow_up_date'
-            upcoming_scheduled_df = filtered_df[
-                (filtered_df['next_follow_up_date'].notna()) &
-                (filtered_df['next_follow_up_date'] > analysis_reference_date)
-            ].copy()
-
-            if not upcoming_scheduled_df.empty:
-                # Columns to include, ensuring 'name' is in the initial list
-                display_cols_base = ['agent', 'name', 'country_name', 'email', 'number', 'next_follow_up_date', 'next_follow_up_time']
-                
-                
-                # Combine base and call date columns, and filter to only include existing columns in the DataFrame
-                display_cols_upcoming_final = [col for col in (display_cols_base) if col in upcoming_scheduled_df.columns]
-                
-                upcoming_scheduled_df_display = upcoming_scheduled_df[display_cols_upcoming_final].sort_values(by='next_follow_up_date', ascending=True)
-                
-                # Define a common rename map for consistency across sections
-                common_rename_map = {
-                    'agent': 'Agent', 
-                    'name': 'Name', 
-                    'country_name': 'Country', 
-                    'email': 'Email', 
-                    'number': 'Number', 
-                    'next_follow_up_date': 'Next Follow Up Date', 
-                    'next_follow_up_time': 'Next Follow Up Time'
-                }
-                
-                upcoming_scheduled_df_display = upcoming_scheduled_df_display.rename(columns=common_rename_map)
-
-                st.write(f"### Upcoming Follow-Up Calls ({len(upcoming_scheduled_df_display)} entries):")
-                st.dataframe(upcoming_scheduled_df_display.reset_index(drop=True), use_container_width=True)
-            else:
-                st.info("No upcoming follow-up calls scheduled with current filters.")
-
-
-
-            st.markdown("---")
-            # --- Section 3: Follow Up Meetings Completed So Far (All actual past call dates) ---
-            st.markdown("### ✅ Follow Up Calls Completed So Far")
-
-            # Prepare a list to store all distinct completed call events
-            completed_events = []
-            
-            # Columns representing actual past calls
-            # --- MODIFICATION START ---
-            # Re-include 'next_follow_up_date' here
-            historical_call_date_cols_map = {
-                #'first_call_date': 'Initial Call',
-                'next_follow_up_date': 'Next Follow-Up Call Completed', # <-- UNCOMMENTED/ADDED THIS LINE
-            }
-            # --- MODIFICATION END ---
-
-            for index, row in filtered_df.iterrows():
-                common_info = {
-                    'Agent': row['agent'],
-                    'Name': row['name'],
-                    'Email': row['email'],
-                    'Number': row['number'],
-                    'Country': row['country_name'],
-                    'Sales Status': row['sales_status']
-                }
-                
-                for col_name, call_stage_name in historical_call_date_cols_map.items():
-                    if col_name in row.index and pd.notna(row[col_name]):
-                        call_date = row[col_name]
-                        # Ensure the call date is within the selected filter range (inclusive of end_date)
-                        if call_date <= end_date:
-                            completed_events.append({
-                                **common_info,
-                                'Follow Up Date': call_date,
-                                'Call Stage': call_stage_name
-                            })
-            
-            completed_events_df = pd.DataFrame(completed_events)
-
-            if not completed_events_df.empty:
-                completed_events_df['Follow Up Date'] = pd.to_datetime(completed_events_df['Follow Up Date']).dt.date
-                
-                # --- MODIFICATION START ---
-                # Re-evaluate drop_duplicates:
-                # If you want the count of "completed_events_df" to EXACTLY match "total_follow_up_calls_overall",
-                # and "total_follow_up_calls_overall" performs no further deduplication than what happens when
-                # summing the individual boolean `notna() & <= filter_end_date` flags,
-                # then this `drop_duplicates` line must be removed or commented out for a direct count match.
-                # The assumption is that each valid date entry (first_call_date or next_follow_up_date) represents
-                # a unique call event to be counted.
-                # completed_events_df = completed_events_df.drop_duplicates(
-                #     subset=['Name', 'Follow Up Date', 'Call Stage'], keep='first'
-                # )
-                # --- MODIFICATION END ---
-                
-                completed_events_df = completed_events_df.sort_values(by='Follow Up Date', ascending=False)
-
-                st.info(f"You have completed {len(completed_events_df)} follow-up meetings so far!")
-                display_cols_completed = ['Agent', 'Name', 'Email', 'Number', 'Country', 'Sales Status', 'Follow Up Date', 'Call Stage']
-                st.dataframe(completed_events_df[display_cols_completed].reset_index(drop=True), use_container_width=True)
-            else:
-                st.info("No past follow-up meetings found.")
-
-    elif tab_key == "report":
-        with st.container():
-            st.subheader(tabs["report"])
-            st.subheader("📥 Generate and Download Report")
-
-            if not filtered_df.empty:
-                report_date = datetime.now().strftime('%Y-%m-%d %H:%M')
-                date_range = f"{filtered_df['date_called'].min().date()} to {filtered_df['date_called'].max().date()}"
-                
-                total_initial_calls_report = filtered_df['is_initial_call'].sum()  
-                total_follow_up_calls_report = filtered_df['total_follow_up_calls'].sum()
-                total_answered_calls_report = (filtered_df['status'] == 'Answered').sum()
-
-                total_entries = len(filtered_df)
-                
-                answered_rate_report = (filtered_df['status'] == 'Answered').mean() * 100
-                total_sales_report = filtered_df['sales_amount'].sum()
-                
-                top_agents_report = filtered_df['agent'].value_counts().head(3).index.tolist()
-                top_countries_report = filtered_df['country_name'].value_counts().head(3).index.tolist()
-                if 'issues' in filtered_df.columns:
-                    outcome_summary_report = (
-                        filtered_df[filtered_df['issues'] != 'N/A']['issues']
-                        .value_counts()
-                        .head(3)
-                        .index
-                        .tolist()
-                    )
-                else:
-                    outcome_summary_report = []
-
-                report_df = pd.DataFrame({
-                    'Metric': [
-                        'Report Date', 'Date Range', 'Total Dataset Entries', 'Total Initial Calls', 'Total Follow-Up Calls',
-                        'Total Answered Calls', 'Answered Rate', 'Total Sales',
-                        'Top 3 Agents', 'Top 3 Countries', 'Common Issues'
-                    ],
-                    'Value': [
-                        report_date, date_range, total_entries, total_initial_calls_report, total_follow_up_calls_report,
-                        total_answered_calls_report,
-                        f"{answered_rate_report:.1f}%", f"${total_sales_report:,.2f}" if not pd.isna(total_sales_report) else "N/A",
-                        ", ".join(top_agents_report), ", ".join(top_countries_report), ", ".join(outcome_summary_report)
-                    ]
-                })
-
-                st.dataframe(report_df)
-
-                csv_buffer = io.StringIO()
-                report_df.to_csv(csv_buffer, index=False)
-
-                st.download_button(
-                    label="📄 Download CSV Report",
-                    data=csv_buffer.getvalue().encode('utf-8'),
-                    file_name=f"sales_report_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                    mime='text/csv',
-                    key="download_report_button"
-                )
-            else:
-                st.info("No data available to generate a report with current filters.")
-else:
-    st.info("No sales data available to display the dashboard. Please check your data source or filters.")
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+import pandas as pd
+import numpy as np
+import seaborn as sns
+import re
+from datetime import datetime, date
+import io
+import json
+import time
+
+# NEW IMPORTS FOR POSTGRESQL
+import psycopg2
+import psycopg2.extras
+import psycopg2.pool
+
+# Copy-on-Write lets pandas skip defensive copies now that nothing mutates in place
+pd.options.mode.copy_on_write = True
+
+st.set_page_config(page_title="Sales Call Dashboard", layout="wide")
+sns.set(style="whitegrid")
+
+# --- Configuration for PostgreSQL ---
+try:
+    db_credentials = st.secrets["postgres"]
+    DB_NAME = db_credentials["dbname"]
+    DB_USER = db_credentials["user"]
+    DB_PASSWORD = db_credentials["password"]
+    DB_HOST = db_credentials["host"]
+    DB_PORT = db_credentials["port"]
+except KeyError:
+    st.error("PostgreSQL credentials not found in Streamlit secrets. Please configure them in .streamlit/secrets.toml.")
+    DB_NAME = "sales_dashboard_db"
+    DB_USER = "postgres"
+    DB_PASSWORD = "Your Password"  # Replace with your actual PostgreSQL password if not using secrets
+    DB_HOST = "localhost"
+    DB_PORT = "5432"
+
+# --- Columns the dashboard actually consumes ---
+# Projection pushdown: 'remarks', 'notes_from_call' and 'post_call_email' are
+# never read by the metric pipeline, so they are not fetched from Postgres.
+USED_COLUMNS = (
+    'name', 'email', 'number', 'country_name', 'agent', 'first_call_date',
+    'status', 'tags', 'interested_category', 'sales_status',
+    'sales_amount', 'next_follow_up_time', 'next_follow_up_date', 'Calling_Stamp', 'Signup_Date'
+)
+
+# --- Issue extraction pattern, compiled once at import ---
+ISSUE_RE = re.compile(
+    r'(Language Barriers|KYC Issues & Complaints|Bonus or Promotions|Network, Inaudible Conversation|Interested|Spread, Leverage & Platform Concerns|Future Deposit|Withdrawal complaint|Wrong number claim|Busy|Geographical permission needed|VOIP restricted country|Payment method issue|Platform Issue|Answered by Another Person|Explorer|Partners Program)',
+    re.IGNORECASE
+)
+
+# Canonical call outcomes (status is normalized to these, so outcome
+# extraction is a set-membership check rather than a regex)
+CALL_OUTCOMES = ('Answered', 'Not answered', 'Invalid number', 'Voicemail')
+
+# Dates arrive from Postgres in ISO form; an explicit format keeps
+# pd.to_datetime off the slow dateutil fallback path.
+DATE_FMT = '%Y-%m-%d'
+
+# Date columns that represent completed follow-up calls; 2nd..Nth-call
+# columns can be appended here and every consumer picks them up.
+FOLLOW_UP_DATE_COLS = ('next_follow_up_date',)
+
+# Fixed colors for the sales statuses the sheet is known to produce; any
+# other status falls back to a stable slot in the shared Plotly palette.
+SALES_STATUS_COLORS = {
+    'Not interested': 'red',
+    'Follow up': 'purple',
+    'Converted': 'green',
+}
+PLOTLY_PALETTE = px.colors.qualitative.Plotly
+
+def _sales_color_map(statuses):
+    return {status: SALES_STATUS_COLORS.get(status, PLOTLY_PALETTE[i % len(PLOTLY_PALETTE)])
+            for i, status in enumerate(statuses)}
+
+# Shared selectbox styling, emitted once per run instead of per-tab copies
+SELECTBOX_CSS = """
+<style>
+    .stSelectbox [data-testid="stSelectbox"] {
+        background-color: #4CAF50;
+        color: white;
+        border-radius: 12px;
+        font-weight: bold;
+        width: 200px;
+        padding: 5px 10px;
+        margin-top: 20px;
+    }
+
+    .stSelectbox [data-testid="stSelectbox"]:hover {
+        background-color: #45a049;
+    }
+
+    .stSelectbox div[role="listbox"] {
+        background-color: #f1f1f1;
+        color: black;
+        border-radius: 12px;
+    }
+
+    .stSelectbox li:hover {
+        background-color: #ddd;
+        color: black;
+    }
+
+    .stSelectbox select:focus {
+        outline: none;
+    }
+</style>
+"""
+
+def centered_metric(title, value):
+    return f"""
+        <div style='text-align: center; line-height: 1.2;'>
+            <div style='font-size: 0.9rem; font-weight: 500; margin-bottom: 0.2rem;'>{title}</div>
+            <div style='font-size: 1.8rem; font-weight: bold;'>{value}</div>
+        </div>
+    """
+
+def top_k(df, col, k=10, ascending=True):
+    """Top-k rows by col via a partial selection instead of a full sort."""
+    vals = df[col].to_numpy()
+    if len(vals) <= k:
+        return df.sort_values(col, ascending=ascending)
+    idx = np.argpartition(-vals, k)[:k]
+    return df.iloc[idx].sort_values(col, ascending=ascending)
+
+def top_k_multi(df, cols, k=10, ascending=True):
+    """Top-k rows for several columns from one stacked argpartition.
+
+    Column-stacking into a single float matrix and partitioning along axis 0
+    reads one contiguous block instead of re-scanning df once per column.
+    Returns {col: ranked frame}.
+    """
+    if len(df) <= k:
+        return {col: df.sort_values(col, ascending=ascending) for col in cols}
+    mat = df[list(cols)].to_numpy(dtype=np.float64)
+    top_idx = np.argpartition(-mat, k, axis=0)[:k]
+    return {col: df.iloc[top_idx[:, j]].sort_values(col, ascending=ascending)
+            for j, col in enumerate(cols)}
+
+def _fixed_counts(series, categories):
+    """Count occurrences of `categories` in one bincount pass over categorical codes."""
+    # Recode explicitly against the caller's order: astype to an unordered
+    # CategoricalDtype with the same category set is a no-op, which would
+    # leave the codes in the source's (alphabetical) order while the result
+    # index below uses the caller's.
+    codes = pd.Categorical(series.to_numpy(), categories=list(categories)).codes
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    return pd.Series(counts, index=list(categories))
+
+# --- Country -> region grouping (single map pass instead of nested np.where) ---
+COUNTRY_GROUP = {
+    'India': 'South Asia',
+    'Pakistan': 'South Asia',
+    'Bangladesh': 'South Asia',
+    'Brazil': 'Latin America',
+    'Argentina': 'Latin America',
+    'Colombia': 'Latin America',
+    'Iraq': 'Middle East',
+    'Saudi Arabia': 'Middle East',
+    'United Arab Emirates': 'Middle East',
+}
+
+# --- Connection pool (kept open across reruns via st.cache_resource) ---
+# Reconnecting on every cache miss pays the full TCP/auth handshake each time;
+# the pool hands out an already-open connection instead.
+@st.cache_resource
+def get_connection_pool(db_host, db_name, db_user, db_password, db_port):
+    return psycopg2.pool.ThreadedConnectionPool(
+        1, 4,
+        host=db_host,
+        database=db_name,
+        user=db_user,
+        password=db_password,
+        port=db_port
+    )
+
+# --- Sidebar Filter Options (Cached) ---
+# Queried separately from the main data load so that pushing the sidebar
+# filters into the SQL WHERE clause does not collapse the option lists.
+@st.cache_data(ttl=60)
+def load_filter_options(db_host, db_name, db_user, db_password, db_port):
+    conn = None
+    pool = None
+    try:
+        pool = get_connection_pool(db_host, db_name, db_user, db_password, db_port)
+        conn = pool.getconn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT agent FROM sales_data WHERE agent IS NOT NULL ORDER BY agent;")
+        agents = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT DISTINCT country_name FROM sales_data WHERE country_name IS NOT NULL ORDER BY country_name;")
+        countries = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT MIN(first_call_date), MAX(first_call_date) FROM sales_data;")
+        min_date, max_date = cursor.fetchone()
+        return {'agents': agents, 'countries': countries, 'min_date': min_date, 'max_date': max_date}
+    except psycopg2.Error:
+        return None
+    finally:
+        if pool and conn:
+            pool.putconn(conn)
+
+# --- Change detection (Cached) ---
+# The sync pipeline truncate-and-loads the whole table, so row-level deltas
+# (modified_at tracking) aren't meaningful here. Instead a cheap probe
+# fingerprints the table; the full COPY below is keyed on it and only re-runs
+# when the fingerprint actually changes. The probe aggregates amounts and
+# statuses alongside the counts/dates so in-place edits to existing rows
+# (the most common sheet change) move the fingerprint too.
+@st.cache_data(ttl=60)
+def _table_fingerprint(db_host, db_name, db_user, db_password, db_port):
+    conn = None
+    pool = None
+    try:
+        pool = get_connection_pool(db_host, db_name, db_user, db_password, db_port)
+        conn = pool.getconn()
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT COUNT(*), COALESCE(SUM(sales_amount), 0), '
+            "COUNT(*) FILTER (WHERE status = 'Answered'), "
+            'COUNT(sales_status), '
+            'MAX(first_call_date), MAX(next_follow_up_date), MAX("Calling_Stamp") '
+            'FROM sales_data;'
+        )
+        return cursor.fetchone()
+    except psycopg2.Error:
+        return None
+    finally:
+        if pool and conn:
+            pool.putconn(conn)
+
+# --- Data Loading (Cached - Modified for PostgreSQL) ---
+# Split in two cached layers: the TTL'd fetch returns the raw CSV payload, and
+# the post-processing layer is keyed on that payload, so a reload that returns
+# identical data reuses the regex/datetime/categorical work instead of
+# repeating it on every cache miss. The 60s TTL matches the baseline refresh
+# cadence: the fingerprint key is an optimization, and any edit it misses
+# still surfaces within a minute.
+@st.cache_data(ttl=60)
+def _fetch_raw_csv(db_host, db_name, db_user, db_password, db_port, expected_cols,
+                   agent_filter="All", country_filter="All", start_date=None, end_date=None,
+                   fingerprint=None):
+    conn = None
+    pool = None
+    try:
+        pool = get_connection_pool(db_host, db_name, db_user, db_password, db_port)
+        conn = pool.getconn()
+        cursor = conn.cursor()
+
+        # Quote all column names for the SQL query
+        quoted_cols = [f'"{col}"' for col in expected_cols]
+
+        # Push the sidebar filters into the WHERE clause so only matching rows
+        # cross the wire and enter pandas. Status is normalized in pandas, so
+        # the status filter stays client-side.
+        where_clauses = []
+        params = []
+        if agent_filter and agent_filter != 'All':
+            where_clauses.append('agent = %s')
+            params.append(agent_filter)
+        if country_filter and country_filter != 'All':
+            where_clauses.append('country_name = %s')
+            params.append(country_filter)
+        if start_date is not None and end_date is not None:
+            where_clauses.append('first_call_date BETWEEN %s AND %s')
+            params.extend([start_date, end_date])
+
+        # Postgres computes the completed-follow-up flag as part of the scan it
+        # already does, so pandas never has to compare dates against today.
+        quoted_cols.append(
+            "(CASE WHEN next_follow_up_date IS NOT NULL AND next_follow_up_date <= CURRENT_DATE"
+            " THEN 1 ELSE 0 END) AS total_follow_up_calls"
+        )
+        query = f"SELECT {', '.join(quoted_cols)} FROM sales_data"
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+
+        # Stream the result set as CSV via COPY instead of fetchall():
+        # parsing is C-vectorized in pandas and skips per-cell tuple boxing.
+        if params:
+            query = cursor.mogrify(query, params).decode()
+        buf = io.StringIO()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH CSV HEADER", buf)
+        return buf.getvalue()
+
+    except psycopg2.Error as e:
+        st.error(f"Error connecting to or querying PostgreSQL database: {e}")
+        st.warning("Displaying a **sample dataset** for visual reference due to database loading issues.")
+        return None
+    finally:
+        if pool and conn:
+            pool.putconn(conn)
+
+# Post-processing cache: keyed on the raw payload hash; the short TTL only
+# exists so the day-relative follow-up counts roll over.
+@st.cache_data(ttl=3600)
+def _postprocess_raw(raw_csv, expected_cols):
+    # Columns are typed DATE/NUMERIC in Postgres, so let the C parser type
+    # them on ingest rather than re-parsing with pandas afterwards. Text
+    # columns get an explicit dtype so the parser skips per-column
+    # type inference.
+    date_cols = [c for c in ('first_call_date', 'next_follow_up_date', 'Calling_Stamp', 'Signup_Date') if c in expected_cols]
+    text_dtypes = {c: str for c in expected_cols if c not in date_cols and c != 'sales_amount'}
+    df_raw = pd.read_csv(
+        io.StringIO(raw_csv),
+        dtype=text_dtypes,
+        parse_dates=date_cols,
+        date_format=DATE_FMT
+    )
+    return _postprocess_frame(df_raw)
+
+# Shared post-processing: the DB payload and the sample-data fallback run
+# through the same pipeline, so cleanup fixes apply to both paths.
+def _postprocess_frame(df_raw):
+    # Ensure column names are consistent (lowercase, underscores)
+    df_raw.columns = df_raw.columns.str.lower().str.strip().str.replace(' ', '_').str.replace('&', 'and')
+
+    # Arrow-backed strings: the .str normalization chains below dispatch to
+    # pyarrow's vectorized UTF-8 kernels instead of per-element Python ops
+    # (pyarrow ships with Streamlit, so no new dependency).
+    # name/email/number are display-only but dominate the frame's string
+    # payload; Arrow storage roughly halves their footprint.
+    for c in ('status', 'sales_status', 'tags', 'name', 'email', 'number'):
+        if c in df_raw.columns:
+            df_raw[c] = df_raw[c].astype('string[pyarrow]')
+
+    # --- Post-processing (similar to your original GSheet loading, but adjusted for DB column names) ---
+    
+    # Process first_call_date to identify initial calls
+    # (pass-through on the DB path, where read_csv already yields datetime64)
+    if 'first_call_date' in df_raw.columns:
+        df_raw['date_called'] = pd.to_datetime(df_raw['first_call_date'], format=DATE_FMT, errors='coerce')
+        df_raw['is_initial_call'] = df_raw['date_called'].notna().astype(int)
+    else:
+        df_raw['date_called'] = pd.NaT
+        df_raw['is_initial_call'] = 0
+        st.warning("Column 'first_call_date' not found in database. Initial call metrics may be inaccurate.")
+
+    # sales_amount is NUMERIC in Postgres and arrives as float64; only NULLs need filling
+    if 'sales_amount' in df_raw.columns:
+        df_raw['sales_amount'] = df_raw['sales_amount'].fillna(0)
+    else:
+        df_raw['sales_amount'] = 0
+        st.warning("Column 'sales_amount' not found. Sales metrics will be zero.")
+
+    # Standardize status column
+    # For 'status'
+    if 'status' in df_raw.columns:
+        # NA propagates through the Arrow kernels and stays unmapped below
+        df_raw['status'] = df_raw['status'].str.strip().str.lower()
+        # Mapping values are already in their final display casing, so no
+        # title-case/replace fixup passes are needed afterwards.
+        status_mapping = {
+            'answered call': 'Answered',
+            'answered': 'Answered',
+            'not answered': 'Not answered',
+            'invalid number': 'Invalid number',
+            'silent call/voicemail': 'Voicemail',
+            'voicemail': 'Voicemail',
+        }
+        df_raw['status'] = df_raw['status'].map(status_mapping)
+    else:
+        df_raw['status'] = 'nan' # Fallback for missing column
+
+
+    # For 'sales_status'
+    if 'sales_status' in df_raw.columns:
+        df_raw['sales_status'] = df_raw['sales_status'].str.strip().str.lower()
+        sales_status_mapping = {
+            'sold': 'Converted',
+            'deal won': 'Converted',
+            'deal complete': 'Converted',
+            'converted': 'Converted',
+            'lost': 'Not interested',
+            'no interest': 'Not interested',
+            'not interested (n)': 'Not interested',
+            'not interested': 'Not interested',
+            'follow up': 'Follow up',
+            'f': 'Follow up',
+        }
+        df_raw['sales_status'] = df_raw['sales_status'].map(sales_status_mapping)
+    else:
+        df_raw['sales_status'] = 'nan'
+
+    # Extract Issues from Tags
+    if 'tags' in df_raw.columns:
+        df_raw['issues'] = df_raw['tags'].str.extract(ISSUE_RE)
+        df_raw['issues'] = df_raw['issues'].fillna('N/A')
+    else:
+        df_raw['issues'] = 'N/A'
+        st.warning("Column 'tags' not found. Issue analysis will be unavailable.")
+
+    # Extract call_outcome from status (statuses are already canonical, so
+    # a membership check replaces the regex)
+    df_raw['call_outcome'] = df_raw['status'].where(df_raw['status'].isin(CALL_OUTCOMES))
+    
+    # Handle country_name consistency
+    if 'country_name' not in df_raw.columns:
+        df_raw['country_name'] = 'Unknown'
+        st.warning("Column 'country_name' not found. Country analysis will be limited.")
+    
+    # Assign country_group
+    df_raw['country_group'] = df_raw['country_name'].map(COUNTRY_GROUP).fillna('Other')
+
+    # --- FOLLOW-UP CALL COUNTING LOGIC ---
+    # total_follow_up_calls is computed by Postgres in the projection; the
+    # pandas comparison only runs for payloads that lack the column.
+    today = datetime.now().date()
+
+    if 'next_follow_up_date' in df_raw.columns:
+        nfud = pd.to_datetime(df_raw['next_follow_up_date'], format=DATE_FMT, errors='coerce')
+        # Kept as datetime64[ns]: .dt.date would box every value into a Python
+        # object and turn downstream comparisons/sorts into object-dtype loops
+        df_raw['next_follow_up_date'] = nfud
+        if 'total_follow_up_calls' not in df_raw.columns:
+            # Only count calls made till today (NaT compares False)
+            df_raw['total_follow_up_calls'] = (nfud <= pd.Timestamp(today)).astype(int)
+    else:
+        df_raw['next_follow_up_date'] = pd.NaT
+        df_raw['total_follow_up_calls'] = 0
+        st.warning("Follow-up column 'next_follow_up_date' not found in database. Follow-up counts may be incomplete.")
+
+    if 'next_follow_up_time' in df_raw.columns:
+        nft = df_raw['next_follow_up_time'].fillna('').astype(str).str.strip()
+        df_raw['next_follow_up_time'] = nft.replace({'NaT': '', 'nan': ''})
+    else:
+        df_raw['next_follow_up_time'] = ''
+        
+    # Ensure 'email' column exists
+    if 'email' not in df_raw.columns:
+        df_raw['email'] = ''
+    if 'agent' not in df_raw.columns:
+        df_raw['agent'] = 'Unknown'
+    else:
+        # Strip once at load so per-tab code can compare agents without
+        # re-running string ops on every rerun
+        df_raw['agent'] = df_raw['agent'].fillna('').astype(str).str.strip()
+
+    # Timestamps (pass-through on the DB path, parsed for other sources)
+    for c in ('calling_stamp', 'signup_date'):
+        if c in df_raw.columns:
+            df_raw[c] = pd.to_datetime(df_raw[c], errors='coerce')
+
+    # Low-cardinality columns: categorical dtype turns downstream filters,
+    # groupbys and value_counts into integer-code operations and shrinks memory.
+    for c in ('agent', 'country_name', 'status', 'sales_status', 'issues',
+              'country_group', 'call_outcome', 'interested_category'):
+        if c in df_raw.columns:
+            df_raw[c] = df_raw[c].astype('category')
+
+    return df_raw
+
+# --- Cached per-tab aggregations ---
+# Streamlit reruns the whole script on every widget interaction (switching a
+# radio, picking an agent), which used to re-run these groupbys each time.
+# The underscore argument is excluded from hashing; cache_key carries the
+# filter state that determines the frame's contents.
+# Boolean helper columns are computed once before grouping so every
+# aggregation uses a built-in Cython reducer rather than a Python lambda
+# invoked per group.
+def _with_rate_flags(df, key):
+    # Narrow projection: assign on the full frame copied every column into
+    # the groupby input, even though only these six matter.
+    return pd.DataFrame({
+        key: df[key],
+        'is_initial_call': df['is_initial_call'],
+        'total_follow_up_calls': df['total_follow_up_calls'],
+        'sales_amount': df['sales_amount'],
+        '_answered': (df['status'] == 'Answered').to_numpy(),
+        '_followup_sale': (df['sales_status'] == 'Follow up').to_numpy(),
+    })
+
+@st.cache_data(show_spinner=False)
+def compute_agent_stats(_df, cache_key):
+    # sort=False: the lexicographic key sort is wasted work — callers rank by
+    # Total_Initial_Calls themselves (nlargest for Top 5, sort_values for All)
+    agent_stats = _with_rate_flags(_df, 'agent').groupby('agent', sort=False, observed=True).agg(
+        Total_Initial_Calls=('is_initial_call', 'sum'),
+        Total_Follow_Up_Calls=('total_follow_up_calls', 'sum'),
+        Total_Answered_Calls=('_answered', 'sum'),
+        Answered_Rate=('_answered', 'mean'),
+        Sales_Follow_Up_Rate=('_followup_sale', 'mean'),
+        Total_Sales=('sales_amount', 'sum'),
+    )
+    agent_stats[['Answered_Rate', 'Sales_Follow_Up_Rate']] *= 100
+    # Halve the bytes moved by every downstream sort/argpartition; call
+    # volumes and percentages fit 32 bits comfortably
+    return agent_stats.astype({
+        'Total_Initial_Calls': 'int32',
+        'Total_Follow_Up_Calls': 'int32',
+        'Total_Answered_Calls': 'int32',
+        'Answered_Rate': 'float32',
+        'Sales_Follow_Up_Rate': 'float32',
+        'Total_Sales': 'float32',
+    })
+
+@st.cache_data(show_spinner=False)
+def _valid_agent_stats(_df, cache_key):
+    """Agent stats with blank agents dropped, plus the sorted agent list."""
+    agent_stats = compute_agent_stats(_df, cache_key).reset_index()
+    agent_stats = agent_stats[agent_stats['agent'] != '']
+    return agent_stats, sorted(agent_stats['agent'].tolist())
+
+@st.cache_data(show_spinner=False)
+def compute_country_stats(_df, cache_key):
+    country_stats = _with_rate_flags(_df, 'country_name').groupby('country_name', sort=False, observed=True).agg(
+        Total_Initial_Calls=('is_initial_call', 'sum'),
+        Total_Follow_Up_Calls=('total_follow_up_calls', 'sum'),
+        Total_Answered_Calls=('_answered', 'sum'),
+        Answered_Rate=('_answered', 'mean'),
+        Sales_Follow_Up_Rate=('_followup_sale', 'mean'),
+        Total_Sales=('sales_amount', 'sum'),
+        Avg_Sale=('sales_amount', 'mean')
+    )
+    country_stats[['Answered_Rate', 'Sales_Follow_Up_Rate']] *= 100
+    country_stats = country_stats.astype({
+        'Total_Initial_Calls': 'int32',
+        'Total_Follow_Up_Calls': 'int32',
+        'Total_Answered_Calls': 'int32',
+        'Answered_Rate': 'float32',
+        'Sales_Follow_Up_Rate': 'float32',
+        'Total_Sales': 'float32',
+        'Avg_Sale': 'float32',
+    })
+    return country_stats.sort_values('Total_Initial_Calls', ascending=False)
+
+@st.cache_data(show_spinner=False)
+def _country_indices(_df, cache_key):
+    """Row positions per country, built once per filtered frame.
+
+    Turns each country selection into an O(1) dict lookup plus an
+    O(group size) take instead of an O(N) compare-and-mask scan.
+    """
+    return _df.groupby('country_name', observed=True).indices
+
+@st.cache_data(show_spinner=False)
+def compute_country_row(_df, country, cache_key):
+    """Stats for a single country, without aggregating the whole table.
+
+    Used by the Individual Country view so it never pays for the full
+    per-country groupby that only the Overall view needs.
+    """
+    idx = _country_indices(_df, cache_key).get(country)
+    if idx is None:
+        return None
+    sub = _with_rate_flags(_df.take(idx), 'country_name')
+    if sub.empty:
+        return None
+    answered = sub['_answered'].to_numpy()
+    sales = sub['sales_amount'].to_numpy()
+    return {
+        'Total_Initial_Calls': int(np.count_nonzero(sub['is_initial_call'].to_numpy())),
+        'Total_Follow_Up_Calls': int(sub['total_follow_up_calls'].to_numpy().sum()),
+        'Total_Answered_Calls': int(np.count_nonzero(answered)),
+        'Answered_Rate': answered.mean() * 100,
+        'Sales_Follow_Up_Rate': sub['_followup_sale'].to_numpy().mean() * 100,
+        'Total_Sales': float(sales.sum()),
+        'Avg_Sale': float(sales.mean()),
+    }
+
+@st.cache_data(show_spinner=False)
+def compute_top_metrics(_df, end_date, cache_key):
+    """One pass over the filtered frame for the five header-tile scalars."""
+    # is_initial_call is a 0/1 flag, so counting nonzeros on the raw buffer
+    # skips pandas' nanops dispatch
+    total_initial_calls = int(np.count_nonzero(_df['is_initial_call'].to_numpy()))
+
+    # Count follow-up calls made till the user-selected end date in one
+    # fused pass over all follow-up columns (NaT compares False, so no
+    # separate notna pass is needed)
+    total_follow_up_calls = 0
+    fu_cols = [c for c in FOLLOW_UP_DATE_COLS if c in _df.columns]
+    if fu_cols:
+        fu_vals = np.column_stack([pd.to_datetime(_df[c], errors='coerce').to_numpy() for c in fu_cols])
+        total_follow_up_calls = int((fu_vals <= np.datetime64(end_date)).sum())
+
+    # Evaluate the answered mask once; the rate is derived from the count
+    # instead of a second reduction over the mask
+    answered_mask = (_df['status'] == 'Answered').to_numpy()
+    total_answered_calls = int(np.count_nonzero(answered_mask))
+    return {
+        'total_initial_calls': total_initial_calls,
+        'total_follow_up_calls': total_follow_up_calls,
+        'total_answered_calls': total_answered_calls,
+        'answered_rate': total_answered_calls * 100.0 / len(_df) if len(_df) else 0.0,
+        'total_sales': float(_df['sales_amount'].to_numpy().sum()),
+    }
+
+@st.cache_data(show_spinner=False)
+def compute_issue_country_crosstab(_df, cache_key):
+    return pd.crosstab(_df['issues'], _df['country_name'])
+
+@st.cache_data(show_spinner=False)
+def compute_country_dist_crosstabs(_df, cache_key):
+    """Per-country status and sales-status counts for the Individual Country view.
+
+    Built once per filter selection; picking a country is then a row lookup
+    instead of a fresh scan of filtered_df.
+    """
+    status_cross = pd.crosstab(_df['country_name'], _df['status'])
+    sales_cross = pd.crosstab(_df['country_name'], _df['sales_status'])
+    return status_cross, sales_cross
+
+@st.cache_data(show_spinner=False)
+def compute_outcome_dist(_df, cache_key):
+    """Percentage distribution of recognised call outcomes for the call tab.
+
+    call_outcome is precomputed at load (status is normalized there too), so
+    this is a categorical value_counts rather than a per-rerun regex extract.
+    """
+    # sort=False skips value_counts' descending sort; sort_values below is
+    # the only ordering this result needs
+    counts = _df['call_outcome'].value_counts(sort=False)
+    counts = counts[counts > 0]  # unobserved categories would chart as 0% bars
+    outcome_dist = counts / counts.sum() * 100 if counts.sum() else counts.astype(float)
+    return outcome_dist.sort_values(ascending=False).round(1)
+
+@st.cache_data(show_spinner=False)
+def compute_pipeline_stats(_df, cache_key):
+    """Pipeline distribution and per-country sales-status mix for answered calls."""
+    # status and sales_status are normalized to canonical values (or NaN) at
+    # load, so integer-code comparisons replace the old strip/'nan' cleanup
+    answered_df = _df[(_df['status'] == 'Answered') & _df['sales_status'].notna()]
+
+    valid_statuses = answered_df['sales_status'].unique().tolist()
+    preferred_order = ['Not interested', 'Follow up', 'Converted']
+    final_statuses = [s for s in preferred_order if s in valid_statuses] + \
+                     [s for s in valid_statuses if s not in preferred_order]
+
+    # final_statuses only lists observed values, so reindexing drops the
+    # unobserved zero-count categories; sort=False skips the count sort the
+    # reindex would discard anyway
+    pipeline_dist = answered_df['sales_status'].value_counts(sort=False).reindex(final_statuses)
+
+    # One grouped size + a single numpy normalize pass instead of
+    # crosstab(normalize='index').mul(100).round(1) re-walking the wide table
+    country_df = answered_df.dropna(subset=['country_name'])
+    counts = country_df.groupby(['country_name', 'sales_status'], observed=True).size().unstack(fill_value=0)
+    totals = counts.to_numpy().sum(axis=1, keepdims=True)
+    cross = pd.DataFrame(
+        np.round(counts.to_numpy() / np.maximum(totals, 1) * 100, 1),
+        index=counts.index,
+        columns=counts.columns,
+    )
+    if final_statuses:
+        cross = cross.reindex(columns=final_statuses, fill_value=0)
+
+    return pipeline_dist, cross, final_statuses
+
+@st.cache_data(show_spinner=False)
+def compute_agent_follow_up_counts(_df, cache_key):
+    """Follow-up call totals per agent, highest first, blanks and zeros dropped."""
+    counts = _df.groupby('agent', observed=True)['total_follow_up_calls'].sum()
+    # Only show agents who actually have follow-up calls (and have a name)
+    counts = counts[(counts.index != '') & (counts > 0)]
+    return counts.sort_values(ascending=False)
+
+@st.cache_data(show_spinner=False)
+def _filtered_csv(_df, cache_key):
+    return _df.to_csv(index=False).encode()
+
+@st.cache_data(show_spinner=False)
+def compute_report_metrics(_df, cache_key):
+    """Every scalar and top-3 list the report tab shows, computed once per filter state."""
+    # One comparison pass feeds both the answered count and rate, and the
+    # column sums come from single-buffer numpy reductions
+    answered = (_df['status'] == 'Answered').to_numpy()
+    total_answered = int(np.count_nonzero(answered))
+
+    def _top3(counts):
+        # Drop unobserved categories first so nlargest never pads the top-3
+        # with zero-count entries when fewer than three values are present
+        counts = counts[counts > 0]
+        return counts.nlargest(3).index.tolist()
+
+    metrics = {
+        'date_range': f"{_df['date_called'].min().date()} to {_df['date_called'].max().date()}",
+        'total_entries': len(_df),
+        'total_initial_calls': int(np.count_nonzero(_df['is_initial_call'].to_numpy())),
+        'total_follow_up_calls': int(_df['total_follow_up_calls'].to_numpy().sum()),
+        'total_answered_calls': total_answered,
+        'answered_rate': total_answered * 100.0 / len(_df) if len(_df) else 0.0,
+        'total_sales': float(_df['sales_amount'].to_numpy().sum()),
+        # nlargest keeps a 3-slot selection instead of sorting the whole
+        # frequency table just to read its head
+        'top_agents': _top3(_df['agent'].value_counts(sort=False)),
+        'top_countries': _top3(_df['country_name'].value_counts(sort=False)),
+    }
+    if 'issues' in _df.columns:
+        metrics['outcome_summary'] = _top3(
+            _df.loc[_df['issues'] != 'N/A', 'issues'].value_counts(sort=False)
+        )
+    else:
+        metrics['outcome_summary'] = []
+    return metrics
+
+@st.cache_data(show_spinner=False)
+def _country_hbar(labels, values, title, xaxis_title, palette, hover_fmt):
+    """Shared horizontal bar builder for the Overall Analysis country charts.
+
+    Takes plain tuples so the cached figure dict is keyed on the chart data
+    itself — identical reruns skip the build entirely.
+    """
+    vals = np.asarray(values)
+    fig = go.Figure(go.Bar(
+        x=vals,
+        y=list(labels),
+        orientation='h',
+        marker=dict(color=vals, colorscale=palette, colorbar=dict(title=xaxis_title)),
+        hovertemplate=hover_fmt
+    ))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title='Country')
+    return fig.to_dict()
+
+# Figure builders return plain dicts so st.cache_data can hash/pickle them;
+# call sites rehydrate with go.Figure(...) which is much cheaper than px rebuilding.
+# These build go traces from plain arrays rather than going through
+# plotly.express, which copies and re-introspects the input frame on
+# every construction — wasted work for aggregates of a few dozen rows.
+@st.cache_data(show_spinner=False)
+def _country_sales_fig(country_sales):
+    sales = country_sales['sales_amount'].to_numpy()
+    fig = go.Figure(go.Bar(
+        x=country_sales['country_name'].to_numpy(),
+        y=sales,
+        marker=dict(
+            color=sales,
+            colorscale='Blues',
+            colorbar=dict(title='Sales Amount'),
+            line=dict(width=1.2, color='darkgrey')
+        ),
+        hovertemplate='<b>Country:</b> %{x}<br><b>Total Sales:</b> $%{y:,.2f}<extra></extra>'
+    ))
+    fig.update_layout(
+        title="Total Sales by Country",
+        hoverlabel=dict(
+            bgcolor="black",
+            font_size=13,
+            font_family="Arial",
+            font_color="white",
+            bordercolor="lightgray"
+        ),
+        xaxis_title="Country",
+        yaxis_title="Total Sales ($)"
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _call_outcome_pie(outcome_counts, colors):
+    fig2 = go.Figure(go.Pie(
+        labels=outcome_counts['call_outcome'].to_numpy(),
+        values=outcome_counts['Count'].to_numpy(),
+        hole=0.5,
+        marker=dict(colors=list(colors)),
+        textinfo='percent+label',
+        textfont=dict(size=12, color='white'),
+        textposition='inside',
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    ))
+    return fig2.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _issue_frequency_fig(display_df):
+    palette = PLOTLY_PALETTE
+    fig3 = go.Figure(go.Bar(
+        x=display_df['Count'].to_numpy(),
+        y=display_df['issues'].to_numpy(),
+        orientation='h',
+        marker=dict(color=[palette[i % len(palette)] for i in range(len(display_df))]),
+        customdata=display_df['Percentage'].to_numpy(),
+        hovertemplate="<b>%{y}</b><br>🔢 Count: %{x}<br>📊 Percentage: %{customdata}%<extra></extra>"
+    ))
+    fig3.update_layout(
+        hoverlabel=dict(
+            bgcolor="black",
+            font_size=12,
+            font_family="Arial",
+            font_color="white"
+        ),
+        yaxis={'categoryorder': 'total ascending'},
+        height=600,
+        margin=dict(t=30, b=20, l=150, r=20),
+        xaxis_title='Count',
+        yaxis_title='Issue Type',
+        showlegend=False
+    )
+    return fig3.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _pipeline_pie(labels, values, colors):
+    fig1 = go.Figure(go.Pie(
+        labels=list(labels),
+        values=list(values),
+        hole=0.4,
+        marker=dict(colors=list(colors)),
+        textinfo='label+percent',
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}'
+    ))
+    fig1.update_layout(title="Sales Pipeline Distribution (Overall)")
+    return fig1.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _pipeline_stack_fig(countries, status_values, statuses, colors, title):
+    fig2 = go.Figure()
+    for status, vals, color in zip(statuses, status_values, colors):
+        fig2.add_bar(
+            x=list(countries),
+            y=list(vals),
+            name=status,
+            marker_color=color,
+            hovertemplate='<b>%{x}</b><br>' +
+                          '%{fullData.name}: <b>%{y:.1f}%</b><extra></extra>'
+        )
+    fig2.update_layout(
+        barmode='stack',
+        title=title,
+        xaxis=dict(title='Country'),
+        yaxis_title='Percentage (%)',
+        legend_title='Sales Status',
+        hovermode='closest',
+        hoverlabel=dict(
+            bgcolor="black",
+            font_size=13,
+            font_family="Arial",
+            font_color="white",
+            bordercolor="lightgray"
+        )
+    )
+    return fig2.to_dict()
+
+def load_full_sales_data_from_db(db_host, db_name, db_user, db_password, db_port, expected_cols,
+                                 agent_filter="All", country_filter="All", start_date=None, end_date=None):
+    fingerprint = _table_fingerprint(db_host, db_name, db_user, db_password, db_port)
+    raw_csv = _fetch_raw_csv(db_host, db_name, db_user, db_password, db_port, expected_cols,
+                             agent_filter=agent_filter, country_filter=country_filter,
+                             start_date=start_date, end_date=end_date,
+                             fingerprint=fingerprint)
+    if raw_csv is None:
+        return pd.DataFrame()
+    return _postprocess_raw(raw_csv, expected_cols)
+
+# Dashboard always runs now
+refresh_interval = st.sidebar.number_input("Auto-refresh interval (seconds)", min_value=0, value=0, key="refresh_interval_input")
+
+
+df = pd.DataFrame()
+data_load_success = False
+filter_options = None
+
+# Current table fingerprint; participates in the filter/aggregation cache keys
+# so a data reload invalidates them even when the row count is unchanged
+data_fingerprint = None
+
+if 'DB_NAME' in locals() and DB_NAME:
+    filter_options = load_filter_options(DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, DB_PORT)
+    data_fingerprint = _table_fingerprint(DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, DB_PORT)
+    df = load_full_sales_data_from_db(
+        DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, DB_PORT, USED_COLUMNS,
+        agent_filter=st.session_state.get("agent_filter", "All"),
+        country_filter=st.session_state.get("country_filter", "All"),
+        start_date=st.session_state.get("start_date"),
+        end_date=st.session_state.get("end_date"),
+    )
+    if not df.empty:
+        data_load_success = True
+        if "data_loaded_message_shown" not in st.session_state:
+            success_message = st.empty()
+            success_message.success(f"Loaded {len(df)} records from PostgreSQL!", icon="✅")
+            time.sleep(1)
+            success_message.empty()
+            st.session_state.data_loaded_message_shown = True
+    else:
+        st.error("Failed to load data from PostgreSQL. Check console for errors or Streamlit secrets.")
+        # Sample Data for fallback
+        df = pd.DataFrame({
+            'name': ['Test User 1', 'Test User 2', 'Test User 3', 'Test User 4', 'Test User 5', 'Test User 6', 'Test User 7', 'Test User 8', 'Test User 9', 'Test User 10', 'Test User 11'],
+            'email': ['test1@example.com', 'test2@example.com', 'test3@example.com', 'test4@example.com', 'test5@example.com', 'test6@example.com', 'test7@example.com', 'test8@example.com', 'test9@example.com', 'test10@example.com', 'test11@example.com'],
+            'number': ['111', '222', '333', '434', '555', '666', '777', '888', '999', '000', '123'],
+            'sales_status': ['Follow up', 'Not interested', 'Converted', 'Follow up', 'Converted', 'Converted', 'Follow up', 'Converted', 'Not interested', 'Follow up', 'Converted'],
+            'sales_amount': [1000.0, 0.0, 500.0, 0.0, 750.0, 2000.0, 300.0, 1200.0, 0.0, 0.0, 800.0],
+            'next_follow_up_time': ['10:00 AM', '', '', '02:30 PM', '', '11:00 AM', '', '', '', '', '09:00 AM'],
+            'next_follow_up_date': ['2023-07-26', '2023-08-01', None, '2023-07-16', None, '2023-07-26', '2023-08-01', None, None, None, '2023-08-15'],
+            'remarks': ['Good', 'Fair', 'Excellent', 'Poor', 'Good', 'Excellent', 'Good', 'Fair', 'Poor', 'Good', 'Excellent'],
+            'agent': ['Agent A', 'Agent B', 'Agent A', 'Agent C', 'Agent B', 'Agent D', 'Agent A', 'Agent E', 'Agent F', 'Agent E', 'Agent G'],
+            'first_call_date': ['2023-01-01', '2023-01-05', '2023-01-10', '2023-01-15', '2023-01-20', '2023-01-25', '2023-01-28', '2023-02-01', '2023-02-05', '2023-02-10', '2023-02-12'],
+            'status': ['Answered', 'Not answered', 'Answered', 'Voicemail', 'Answered', 'Answered', 'Answered', 'Answered', 'Answered', 'Not answered', 'Answered'],
+            'notes_from_call': ['Detailed discussion', 'No answer', 'Converted lead', 'Left voicemail', 'Platform discussed', 'High interest', 'Follow up needed', 'Interested in future', 'Complaint received', 'Busy, call back', 'Converted lead'],
+            'tags': ['Language Barriers', 'N/A', 'Interested', 'N/A', 'Platform Issue', 'N/A', 'Interested', 'N/A', 'KYC Issues & Complaints', 'N/A', 'N/A'],
+            'interested_category': ['Hot Lead (1-3 Days)', 'Warm Lead (1-2 weeks)', 'Warm Lead (1 month)', 'Cold Lead (1-3 Months)', 'Hot Lead (1-3 Days)', 'Warm Lead (1-2 weeks)', 'Hot Lead (1-3 Days)', 'Warm Lead (1-2 weeks)', 'Cold Lead (1-3 Months)', 'Cold Lead (1-3 Months)', 'Warm Lead (1-2 weeks)'],
+            'country_name': ['India', 'Brazil', 'Pakistan', 'Iraq', 'India', 'Cyprus', 'India', 'Brazil', 'Pakistan', 'Iraq', 'Cyprus'],
+            'Calling_Stamp': ['2023-01-01 10:00:00', '2023-01-05 11:00:00', '2023-01-10 12:00:00', '2023-01-15 13:00:00', '2023-01-20 14:00:00', '2023-01-25 15:00:00', '2023-01-28 16:00:00', '2023-02-01 17:00:00', '2023-02-05 18:00:00', '2023-02-10 19:00:00', '2023-02-12 20:00:00'],
+            'Signup_Date': ['2023-01-01', '2023-01-05', '2023-01-10', '2023-01-15', '2023-01-20', '2023-01-25', '2023-01-28', '2023-02-01', '2023-02-05', '2023-02-10', '2023-02-12']
+        })
+        # Same post-processing pipeline as the DB path, so the fallback never
+        # drifts behind the real loader.
+        df = _postprocess_frame(df)
+
+
+if not df.empty:
+    
+    # Single hashed pass (O(#categories) on categorical dtype) instead of the
+    # old bool-coerce / .loc copy / nunique triple scan.
+    total_unique_agents_in_dataset = df['agent'].replace({'': pd.NA, None: pd.NA}).nunique()
+
+    # Copy-on-Write is on, so this alias is free; any later column write
+    # copies just that column
+    current_user_df = df
+    
+    if filter_options and filter_options['min_date'] and filter_options['max_date']:
+        data_min_date = filter_options['min_date']
+        data_max_date = filter_options['max_date']
+    elif not current_user_df.empty and 'date_called' in current_user_df.columns and not current_user_df['date_called'].isnull().all():
+        data_min_date = current_user_df['date_called'].min().date()
+        data_max_date = current_user_df['date_called'].max().date()
+    else:
+        data_min_date = date(2023, 1, 1)
+        data_max_date = date.today()
+
+    if "agent_filter" not in st.session_state:
+        st.session_state["agent_filter"] = "All"
+    if "country_filter" not in st.session_state:
+        st.session_state["country_filter"] = "All"
+    if "status_filter" not in st.session_state:
+        st.session_state["status_filter"] = "All"
+    
+    # Initialize start_date and end_date in session state, with "Today" option
+    if "start_date" not in st.session_state:
+        st.session_state["start_date"] = data_min_date
+    if "end_date" not in st.session_state:
+        st.session_state["end_date"] = data_max_date
+    
+    def update_start_date():
+        st.session_state["start_date"] = st.session_state["start_date_input"]
+        if st.session_state["start_date"] > st.session_state["end_date"]:
+            st.session_state["end_date"] = st.session_state["start_date"]
+
+    def update_end_date():
+        st.session_state["end_date"] = st.session_state["end_date_input"]
+        if st.session_state["end_date"] < st.session_state["start_date"]:
+            st.session_state["start_date"] = st.session_state["end_date"]
+
+
+    # Option lists come from the dedicated options query so they stay complete
+    # even when the main query is already filtered server-side.
+    if filter_options:
+        agent_list = ['All'] + [a for a in filter_options['agents'] if a]
+        country_list = ['All'] + [c for c in filter_options['countries'] if c]
+    else:
+        agent_list = ['All'] + sorted(current_user_df['agent'].dropna().unique().tolist())
+        country_list = ['All'] + sorted(current_user_df['country_name'].dropna().unique().tolist())
+    agent_index = agent_list.index(st.session_state['agent_filter']) if st.session_state['agent_filter'] in agent_list else 0
+    agent_filter = st.sidebar.selectbox("Select Agent", agent_list, index=agent_index, key="agent_filter")
+
+    # status is categorical on the DB path, so its options come straight from
+    # the (tiny) category index rather than a full-column unique scan per rerun.
+    if isinstance(current_user_df['status'].dtype, pd.CategoricalDtype):
+        status_list = ['All'] + sorted(current_user_df['status'].cat.categories.dropna().tolist())
+    else:
+        status_list = ['All'] + sorted(current_user_df['status'].dropna().unique().tolist())
+
+    country_index = country_list.index(st.session_state['country_filter']) if st.session_state['country_filter'] in country_list else 0
+    status_index = status_list.index(st.session_state['status_filter']) if st.session_state['status_filter'] in status_list else 0
+
+    country_filter = st.sidebar.selectbox("Select Country", country_list, index=country_index, key="country_filter")
+    status_filter = st.sidebar.selectbox("Select Call Status", status_list, index=status_index, key="status_filter")
+
+    # Add "Today" option for Start Date
+    start_date_options = [data_min_date, date.today()] if data_min_date <= date.today() else [data_min_date]
+    start_date_value = st.session_state["start_date"]
+    
+    if start_date_value == date.today():
+        start_date_index = start_date_options.index(date.today()) if date.today() in start_date_options else 0
+    else:
+        start_date_index = start_date_options.index(start_date_value) if start_date_value in start_date_options else 0
+
+    st.sidebar.date_input(
+        "Start Date",
+        value=start_date_value,
+        min_value=data_min_date,
+        max_value=data_max_date,
+        key="start_date_input",
+        on_change=update_start_date
+    )
+    
+    # Add "Today" option for End Date
+    end_date_options = [data_max_date, date.today()] if data_max_date >= date.today() else [data_max_date]
+    end_date_value = st.session_state["end_date"]
+
+    if end_date_value == date.today():
+        end_date_index = end_date_options.index(date.today()) if date.today() in end_date_options else 0
+    else:
+        end_date_index = end_date_options.index(end_date_value) if end_date_value in end_date_options else 0
+
+    st.sidebar.date_input(
+        "End Date",
+        value=end_date_value,
+        min_value=data_min_date,
+        max_value=data_max_date,
+        key="end_date_input",
+        on_change=update_end_date
+    )
+
+    start_date = st.session_state["start_date"]
+    end_date = st.session_state["end_date"]
+
+
+    # Reruns that don't touch the filters (tab switches, in-tab widgets)
+    # reuse the frame stashed in session_state instead of re-masking. The
+    # fingerprint keeps a content-only data reload from replaying a stale frame.
+    filter_sig = (agent_filter, country_filter, status_filter, start_date, end_date,
+                  len(current_user_df), data_fingerprint)
+
+    # Combine all sidebar filters into one boolean mask and index once,
+    # instead of materializing an intermediate DataFrame per filter.
+    if st.session_state.get('_filter_sig') == filter_sig:
+        filtered_df = st.session_state['_filtered_df']
+    elif 'date_called' in current_user_df.columns:
+        mask = np.ones(len(current_user_df), dtype=bool)
+        if agent_filter != 'All':
+            mask &= (current_user_df['agent'] == agent_filter).to_numpy()
+        if country_filter != 'All':
+            mask &= (current_user_df['country_name'] == country_filter).to_numpy()
+        if status_filter != 'All':
+            mask &= (current_user_df['status'] == status_filter).to_numpy()
+
+        # Compare in datetime64 space: .dt.date would box every timestamp into
+        # a Python date object before comparing. NaT compares False on both ends.
+        date_vals = pd.to_datetime(current_user_df['date_called'], errors='coerce').to_numpy()
+        start64 = np.datetime64(start_date)
+        end64 = np.datetime64(end_date) + np.timedelta64(1, 'D')
+        mask &= (date_vals >= start64) & (date_vals < end64)
+
+        filtered_df = current_user_df.loc[mask]
+        # Aggregations downstream hammer these columns; make sure the masked
+        # take didn't leave them as strided views into a wider block
+        for c in ('sales_amount', 'is_initial_call', 'total_follow_up_calls'):
+            if c in filtered_df.columns:
+                v = filtered_df[c].to_numpy()
+                if not v.flags['C_CONTIGUOUS']:
+                    filtered_df[c] = np.ascontiguousarray(v)
+        st.session_state['_filter_sig'] = filter_sig
+        st.session_state['_filtered_df'] = filtered_df
+    else:
+        st.warning("date_called column not found or is empty after filtering. Time-based filters may not work as expected.")
+        filtered_df = pd.DataFrame(columns=df.columns)
+
+    # Cache key for the per-tab aggregations: the filter state plus the table
+    # fingerprint, so a data reload busts these entries even when the filtered
+    # row count happens to stay the same.
+    filter_state = (agent_filter, country_filter, status_filter, start_date, end_date,
+                    len(filtered_df), data_fingerprint)
+
+    st.markdown("""
+    <style>
+    /* Main tab container - for the overall box */
+    /* This is the div that Streamlit wraps the radio group in */
+    .stRadio > div {
+        background-color: transparent; /* Remove any default background */
+        border-radius: 15px;
+        box-shadow: none; /* Remove default outer shadow */
+        margin-bottom: 1.8rem;
+        /* A subtle border around the entire group of tabs */
+        border: 1px solid rgba(255, 255, 255, 0.1);  
+        padding: 1px; /* Remove internal padding */
+        overflow: hidden; /* Ensures rounded corners clip correctly */
+    }
+    
+    /* Tab group layout - targets the internal div with role="radiogroup" */
+    .stRadio [role="radiogroup"] {
+        display: flex; /* Enable flexbox for horizontal layout */
+        flex-wrap: nowrap; /* <<-- KEY CHANGE: Prevents wrapping to next line */
+        gap: 2px; /* Remove space between individual tabs */
+        padding: 10px; /* Remove padding from the actual radio group */
+        background-color: #262730; /* Dark background for the tab row itself */
+        border-radius: 15px; /* Apply rounded corners to the tab row */
+        overflow: hidden; /* Ensure content is clipped by border-radius */
+    }
+    
+    /* Individual tabs - targets the internal div with role="radio" */
+    .stRadio [role="radio"] {
+        background-color: #262730; /* Default tab background (dark) */
+        border: none; /* Remove individual borders */
+        border-radius: 0px; /* Make them square to connect */
+        padding: 10px 18px; /* Standard padding for each tab */
+        margin: 0; /* No margin between tabs */
+        transition: all 0.2s ease-in-out; /* Smooth transitions for hover/active states */
+        box-shadow: none; /* Remove individual shadow */
+        flex-grow: 1; /* Allows tabs to grow and fill available space evenly */
+        text-align: center; /* Center text within each tab */
+        color: #ccc; /* Lighter text for non-active tabs */
+        font-weight: 400;
+        cursor: pointer; /* Indicate clickable */
+        user-select: none; /* Prevent text selection */
+        display: flex; /* Use flexbox for content alignment */
+        align-items: center;
+        justify-content: center;
+        min-width: 0; /* Allow tabs to shrink as much as needed */
+    }
+    
+    /* Add subtle border between tabs */
+    .stRadio [role="radio"]:not(:last-child) {
+        border-right: 1px solid rgba(255, 255, 255, 0.05); /* Very subtle vertical separator */
+    }
+    
+    /* Hover effect for individual tabs */
+    .stRadio [role="radio"]:hover {
+        background-color: #363740; /* Slightly lighter dark on hover */
+        color: #fff; /* White text on hover */
+    }
+    
+    /* Active tab styling */
+    .stRadio [role="radio"][aria-checked="true"] {
+        background-color: #1a73e8; /* Blue for active tab */
+        color: white;
+        font-weight: 500;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.2); /* More prominent shadow for active tab */
+        position: relative; /* Needed for z-index to bring active tab forward */
+        z-index: 1; /* Bring active tab slightly forward */
+    }
+    
+    /* Hide default radio button circle */
+    .stRadio [role="radio"] > div:first-child {
+        display: none;
+    }
+
+    /* Adjust icon size and margin within tabs */
+    .stRadio [role="radio"] svg {
+        font-size: 1.2em; /* Make icons slightly larger */
+        margin-right: 5px; /* Space between icon and text */
+        flex-shrink: 0; /* Prevent icons from shrinking */
+    }
+
+    /* Target the span containing the text label, allowing it to truncate */
+    .stRadio [role="radio"] span {
+        white-space: nowrap; /* Keep text on one line */
+        overflow: hidden; /* Hide overflowing text */
+        text-overflow: ellipsis; /* Add ellipsis (...) if text overflows */
+    }
+    
+    /* Metric cards - keep previous styling as they are good */
+    .metric-card {
+        background: white;
+        border-radius: 10px;
+        padding: 15px;
+        box-shadow: 0 2px 5px rgba(0,0,0,0.05);
+        height: 100%;
+        border: 1px solid #f0f0f0;
+    }
+    .metric-title {
+        font-size: 0.9rem;
+        color: #5f6368;
+        margin-bottom: 8px;
+        font-weight: 500;
+    }
+    .metric-value {
+        font-size: 1.8rem;
+        font-weight: 700;
+        color: #202124;
+    }
+    
+    /* Dark mode support */
+    @media (prefers-color-scheme: dark) {
+        .stRadio > div {
+            border: 1px solid #444; /* Darker border for tab group */
+        }
+        .stRadio [role="radio"] {
+            background-color: #2b2b2b; /* Darker background for tabs */
+            color: #aaa;
+        }
+        .stRadio [role="radio"]:not(:last-child) {
+            border-right: 1px solid #444; /* Darker separator */
+        }
+        .stRadio [role="radio"]:hover {
+            background-color: #3b3b3b; /* Darker hover */
+            color: #fff;
+        }
+        .stRadio [role="radio"][aria-checked="true"] {
+            background-color: #0d47a1; /* Darker blue for active tab */
+            color: white;
+            border-color: #0d47a1;
+        }
+        .metric-card {
+            background: #2b2b2b;
+            border-color: #444;
+        }
+        .metric-title {
+            color: #aaa;
+        }
+        .metric-value {
+            color: #fff;
+        }
+    }
+    /* CSS for st.selectbox elements */
+    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] {
+        background-color: #5C6BC0;
+        color: white;
+        border-radius: 12px;
+        font-weight: bold;
+        padding: 5px 10px;
+        margin-top: 20px;
+        border: 1px solid #5C6BC0;
+        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+    }
+    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] div[data-testid="stMuiSelect"] {
+        color: white;
+        font-weight: bold;
+    }
+    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] svg {
+        fill: white;
+    }
+    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"]:hover {
+        background-color: #7986CB;
+        border-color: #7986CB;
+    }
+    .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"]:focus-within {
+        border-color: #9FA8DA;
+        box-shadow: 0 0 0 0.2rem rgba(159, 168, 218, 0.25);
+    }
+    /* Dark mode for selectbox */
+    @media (prefers-color-scheme: dark) {
+        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] {
+            background-color: #424242;
+            border-color: #616161;
+        }
+        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"]:hover {
+            background-color: #555;
+            border-color: #757575;
+        }
+        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stMuiSelect"] {
+            color: #fff;
+        }
+        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"] svg {
+            fill: #fff;
+        }
+        .stSelectbox [data-testid="stSelectboxContainer"] div[data-testid="stSelectbox"]:focus-within {
+            border-color: #9E9E9E;
+            box-shadow: 0 0 0 0.2rem rgba(158, 158, 158, 0.25);
+        }
+    }
+    </style>
+    """, unsafe_allow_html=True)
+    st.markdown(SELECTBOX_CSS, unsafe_allow_html=True)
+
+
+    # Dashboard Metrics Layout
+    st.subheader("📊 Dashboard")
+    
+    if not filtered_df.empty:
+
+        # All five header scalars come from one cached pass keyed on the
+        # current filter selection, so reruns that don't change the filters
+        # (tab switches, widget clicks) skip the aggregation entirely
+        top_metrics = compute_top_metrics(filtered_df, end_date, filter_state)
+        total_initial_calls = top_metrics['total_initial_calls']  # Initial Calls
+        total_follow_up_calls_overall = top_metrics['total_follow_up_calls']
+
+        total_calls = total_initial_calls + total_follow_up_calls_overall  # Total Calls Made
+
+        # Total Calls (including answered and non-answered)
+        total_calls_display = f"{total_calls}" if not filtered_df.empty else "0"
+
+        total_answered_calls = top_metrics['total_answered_calls']
+        answered_rate_val = top_metrics['answered_rate']
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        total_entries = len(filtered_df)
+        answered_rate = f"{answered_rate_val:.1f}%" if not filtered_df.empty else "0.0%"
+        
+        answered_calls_display = f"{total_answered_calls} ({answered_rate})" if not filtered_df.empty else "0 (0.0%)"
+        
+        total_sales = top_metrics['total_sales']
+        total_sales_value = f"${total_sales:,.2f}" if not np.isnan(total_sales) else "N/A"
+
+        col1.markdown(centered_metric("Total Calls Made", total_calls_display), unsafe_allow_html=True)
+        col2.markdown(centered_metric("Total Initial Calls", total_initial_calls), unsafe_allow_html=True)
+        col3.markdown(centered_metric("Total Follow-Up Calls Made", total_follow_up_calls_overall), unsafe_allow_html=True)
+        col4.markdown(centered_metric("Answered Calls", answered_calls_display), unsafe_allow_html=True)
+        col5.markdown(centered_metric("Total Sales Generated", total_sales_value), unsafe_allow_html=True)  
+
+    else:
+        st.info("No data available to display dashboard metrics based on current filters.")
+
+
+    tabs = {
+        "home": "📈 Home",
+        "data": "📟 Data Overview",
+        "agent": "👨‍💼 Agent Performance",
+        "country": "🌍 Country Analysis",
+        "call": "📞 Call Outcome",
+        "pipeline": "📈 Sales Pipeline",
+        "followup": "🗓️ Follow Up Calling",
+        "report": "📅 Report Generator"
+    }
+    
+    query_params = st.query_params
+    default_tab_raw = query_params.get("tab", ["home"])[0]
+    
+    if default_tab_raw not in tabs:
+        default_tab = "home"
+    else:
+        default_tab = default_tab_raw
+
+    st.query_params.update(tab=default_tab)
+
+    tab_key = st.radio(
+        "",
+        list(tabs.keys()),
+        format_func=lambda k: tabs[k],
+        index=list(tabs.keys()).index(default_tab),
+        horizontal=True,
+        key="main_tabs_radio"
+    )
+
+    st.query_params.update(tab=tab_key)
+
+
+    if tab_key == "home":
+        @st.fragment
+        def _render_home_tab():
+            with st.container():
+                st.subheader(tabs["home"])
+
+            with st.expander("Sales Distribution by Country"):
+                st.subheader("Sales by Country")
+
+                if not filtered_df.empty:
+                    # Sum sales per country straight off the categorical codes —
+                    # a weighted bincount beats a groupby for a single reduction
+                    codes = filtered_df['country_name'].cat.codes.to_numpy()
+                    sales = filtered_df['sales_amount'].to_numpy(dtype=float)
+                    categories = filtered_df['country_name'].cat.categories
+                    valid = codes >= 0
+                    totals = np.bincount(codes[valid], weights=sales[valid],
+                                         minlength=len(categories))
+                    # Only chart countries with rows under the current filters;
+                    # the category index also covers unobserved countries
+                    observed = np.bincount(codes[valid], minlength=len(categories)) > 0
+                    country_sales = pd.DataFrame({
+                        'country_name': categories[observed],
+                        'sales_amount': totals[observed],
+                    })
+
+                    st.plotly_chart(go.Figure(_country_sales_fig(country_sales)), use_container_width=True)
+                else:
+                    st.info("No sales data available for charts with current filters.")
+
+
+            custom_colors = ["#6D6D6D", "#019C0E", "#27288B", "#C52E00"]
+
+            with st.expander("Call Outcome"):
+                st.subheader("Call Outcomes Pie Chart")
+                if not filtered_df.empty:
+                    # categorical value_counts includes unobserved outcomes;
+                    # zero-count slices would still show up in the legend
+                    outcome_counts = filtered_df['call_outcome'].value_counts()
+                    outcome_counts = outcome_counts[outcome_counts > 0].reset_index()
+                    outcome_counts.columns = ['call_outcome', 'Count']
+
+                    st.plotly_chart(go.Figure(_call_outcome_pie(outcome_counts, tuple(custom_colors))), use_container_width=True)
+                else:
+                    st.info("No call outcome data available for charts with current filters.")
+
+
+            if 'selected_issue' not in st.session_state:
+                st.session_state.selected_issue = None
+
+            with st.expander("Issues"):
+                st.subheader("Issue Frequency")
+                if not filtered_df.empty:
+                    # same guard as the pie: unobserved issue categories would
+                    # chart as 0-count bars and leak into the selectbox below
+                    outcome_counts = filtered_df['issues'].value_counts()
+                    outcome_counts = outcome_counts[outcome_counts > 0].reset_index()
+                    outcome_counts.columns = ['issues', 'Count']
+
+                    total_issues = outcome_counts['Count'].sum()
+                    display_df = outcome_counts[outcome_counts['issues'] != 'N/A']
+                
+                    if not display_df.empty:
+                        # Plain NumPy arithmetic — skips Series alloc and index alignment
+                        pct = np.round(display_df['Count'].to_numpy() * (100.0 / total_issues), 2)
+                        display_df = display_df.assign(Percentage=pct)
+
+                        st.plotly_chart(go.Figure(_issue_frequency_fig(display_df)), use_container_width=False)
+                    else:
+                        st.info("No issues (excluding 'N/A') found with current filters.")
+                else:
+                    st.info("No data available for issue frequency analysis with current filters.")
+
+            
+            st.subheader("Country by Issue Frequency Search")
+
+            if not filtered_df.empty and 'issues' in filtered_df.columns:
+                available_issues = display_df['issues'].tolist() if not display_df.empty else []
+                if available_issues:
+                    selected_issue = st.selectbox(
+                                                    "Select an Issue to see",
+                                                    available_issues,
+                                                    index=0 if st.session_state.selected_issue not in available_issues else available_issues.index(st.session_state.selected_issue),
+                                                    key="issue_selectbox"
+                                                )
+
+                    st.session_state.selected_issue = selected_issue
+
+                    # The full issue x country table is cached once per filter
+                    # selection; each selectbox pick is then a single row lookup
+                    issue_country = compute_issue_country_crosstab(filtered_df, filter_state)
+                    issue_counts = issue_country.loc[selected_issue] if selected_issue in issue_country.index else None
+
+                    if issue_counts is not None and issue_counts.sum() > 0:
+                        # The crosstab emits every country category; only show
+                        # countries that actually reported this issue
+                        issue_counts = issue_counts[issue_counts > 0]
+                        country_issue_counts = issue_counts.sort_values(ascending=False).reset_index()
+                        country_issue_counts.columns = ['Country', 'Count']
+
+                        st.subheader(f"Countries with '{selected_issue}' issue")
+                        st.dataframe(country_issue_counts)
+                    else:
+                        st.warning(f"No data available for '{selected_issue}' issue.")    
+                else:
+                    st.info("No issues found in the filtered data to select.")
+            else:
+                st.info("No data available for issue frequency search with current filters.")
+
+
+        _render_home_tab()
+    elif tab_key == "data":
+        with st.container():
+            st.subheader(tabs["data"])
+
+        with st.expander("Filtered Raw Data"):
+            st.subheader("Filtered Raw Data")
+            if not filtered_df.empty:
+                # Serializing the whole frame to Arrow on every rerun gets
+                # expensive at call-center volumes; show a window and offer
+                # the full set as a (cached) CSV download instead.
+                MAX_DATA_TAB_ROWS = 10_000
+                st.dataframe(filtered_df.head(MAX_DATA_TAB_ROWS))
+                if len(filtered_df) > MAX_DATA_TAB_ROWS:
+                    st.caption(f"Showing first {MAX_DATA_TAB_ROWS:,} of {len(filtered_df):,} rows.")
+                st.download_button(
+                    "Download full CSV",
+                    data=_filtered_csv(filtered_df, filter_state),
+                    file_name="filtered_sales_data.csv",
+                    mime="text/csv",
+                )
+            else:
+                st.info("No data found matching the selected filters.")
+        
+
+    elif tab_key == "agent":
+        @st.fragment
+        def _render_agent_tab():
+            with st.container():
+                st.subheader(tabs["agent"])
+            
+                if not filtered_df.empty:
+                    agent_stats, valid_agents = _valid_agent_stats(filtered_df, filter_state)
+
+                    st.subheader("Agent Performance Visualizations")
+
+                    agent_view_option = st.radio(
+                        "Select Agent View:",
+                        ["Top 5 Agents", "All Agents", "Individual Agent"],  
+                        horizontal=True,
+                        key="agent_view_radio"
+                    )
+
+                    if agent_view_option == "Individual Agent":
+                        if valid_agents:
+                            selected_agent = st.selectbox(
+                                "Select an Agent",
+                                valid_agents,
+                                index=0,
+                                key="selected_agent_selectbox"
+                            )
+
+                            agent_df = filtered_df[filtered_df['agent'] == selected_agent]
+
+                            if agent_df.empty:
+                                st.warning(f"No data available for {selected_agent}.")
+                            else:
+                                # The per-agent scalars already exist in agent_stats —
+                                # one row lookup instead of four more passes over agent_df
+                                agent_row = agent_stats.loc[agent_stats['agent'] == selected_agent].iloc[0]
+                                total_initial_calls_agent = int(agent_row['Total_Initial_Calls'])
+                                total_follow_up_calls_agent = int(agent_row['Total_Follow_Up_Calls'])
+                                total_answered_calls_agent = int(agent_row['Total_Answered_Calls'])
+
+                                st.subheader(f"📊 {selected_agent}'s Performance")
+                            
+                                col1, col2, col3, col4, col5 = st.columns(5)
+                            
+                                call_outcomes = _fixed_counts(
+                                    agent_df['status'],
+                                    ('Answered', 'Not answered', 'Voicemail', 'Invalid number')
+                                )
+
+                                with col1:
+                                    st.metric("📞 Initial Calls", f"{total_initial_calls_agent}")  
+                                with col2:  
+                                    st.metric("🔄 Follow-Up Calls", f"{total_follow_up_calls_agent}")
+                                with col3:
+                                    st.metric("✅ Answered Calls", f"{total_answered_calls_agent} ({agent_row['Answered_Rate']:.1f}%)")
+                                with col4:
+                                    st.metric("📈 Sales Follow Up Rate",
+                                                f"{agent_row['Sales_Follow_Up_Rate']:.1f}%" if total_initial_calls_agent > 0 else "0.0%")
+                                with col5:
+                                    st.metric("💰 Total Sales",
+                                                f"${agent_row['Total_Sales']:,.2f}")
+                            
+                                st.markdown(f"**Detailed Breakdown for {selected_agent}:**")
+
+                                call_outcome_colors = {
+                                    'Answered': 'green',
+                                    'Not answered': 'gray',
+                                    'Invalid number': 'red',
+                                    'Voicemail': 'blue'
+                                }
+
+                                fig_call = px.pie(
+                                    call_outcomes,
+                                    names=call_outcomes.index,
+                                    values=call_outcomes.values,
+                                    title=f"{selected_agent} - Call Outcome Distribution",
+                                    hole=0.4,
+                                    color=call_outcomes.index,
+                                    color_discrete_map=call_outcome_colors
+                                )
+                                fig_call.update_traces(
+                                    hovertemplate="<b>%{label}</b><br>Calls: %{value}<br>Share: %{percent:.2f}%",
+                                    textinfo='percent+label',
+                                    texttemplate='%{percent:.0%}' if '%{percent}' != '0%' else '',
+                                    textposition='inside'
+                                )
+                                st.plotly_chart(fig_call, use_container_width=True)
+
+                                sales_status_colors = {
+                                    'Follow up': 'purple',
+                                    'Not interested': 'red',
+                                    'Converted': 'green'
+                                }
+                                sales_dist = _fixed_counts(agent_df['sales_status'], ('Follow up', 'Not interested', 'Converted'))
+                                fig_sales = px.pie(
+                                    sales_dist,
+                                    names=sales_dist.index,
+                                    values=sales_dist.values,
+                                    title=f"{selected_agent} - Sales Status Distribution",
+                                    hole=0.4,
+                                    color=sales_dist.index,
+                                    color_discrete_map=sales_status_colors
+                                )
+                                fig_sales.update_traces(
+                                    hovertemplate="<b>%{label}</b><br>Calls: %{value}<br>Share: %{percent:.2f}%",
+                                    textinfo='percent+label',
+                                    texttemplate='%{percent:.0%}' if '%{percent}' != '0%' else '',
+                                    textposition='inside'
+                                )
+                                st.plotly_chart(fig_sales, use_container_width=True)
+                        else:
+                            st.info("No agents found in the filtered data to display individual performance.")
+
+                    else:
+                        if agent_view_option == "Top 5 Agents":
+                            # Partial selection — no need to sort the whole table for 5 rows
+                            selected_agents = agent_stats.nlargest(5, 'Total_Initial_Calls')
+                            view_title_prefix = "Top 5 "
+                        else:
+                            selected_agents = agent_stats.sort_values('Total_Initial_Calls', ascending=False)
+                            view_title_prefix = "All "
+
+                        fig_initial_calls = px.bar(
+                            selected_agents,
+                            x='agent',
+                            y='Total_Initial_Calls',
+                            title=f'{view_title_prefix}Agents by Total Initial Call Volume',
+                            labels={'Total_Initial_Calls': 'Total Initial Calls', 'agent': 'Agent'},
+                            color='agent',
+                            color_discrete_sequence=px.colors.qualitative.Plotly
+                        )
+                        fig_initial_calls.update_traces(
+                            hovertemplate="<b>Agent:</b> %{x}<br><b>Total Initial Calls:</b> %{y}<extra></extra>"
+                        )
+                        fig_initial_calls.update_layout(showlegend=False)
+                        st.plotly_chart(fig_initial_calls, use_container_width=True)
+                    
+                        fig_follow_up = px.bar(
+                            selected_agents,
+                            x='agent',
+                            y='Total_Follow_Up_Calls',
+                            title=f'{view_title_prefix}Agents by Total Follow-Up Call Volume',
+                            labels={'Total_Follow_Up_Calls': 'Total Follow-Up Calls', 'agent': 'Agent'},
+                            color='agent',
+                            color_discrete_sequence=px.colors.qualitative.Safe
+                        )
+                        fig_follow_up.update_traces(
+                            hovertemplate="<b>Agent:</b> %{x}<br><b>Total Follow-Up Calls:</b> %{y}<extra></extra>"
+                        )
+                        fig_follow_up.update_layout(showlegend=False)
+                        st.plotly_chart(fig_follow_up, use_container_width=True)
+
+                        fig_answered_calls = px.bar(
+                            selected_agents,
+                            x='agent',
+                            y='Total_Answered_Calls',
+                            title=f'{view_title_prefix}Agents by Total Answered Calls',
+                            labels={'Total_Answered_Calls': 'Total Answered Calls', 'agent': 'Agent'},
+                            color='agent',
+                            color_discrete_sequence=px.colors.qualitative.Plotly
+                        )
+                        fig_answered_calls.update_traces(
+                            hovertemplate="<b>Agent:</b> %{x}<br><b>Total Answered Calls:</b> %{y}<extra></extra>"
+                        )
+                        fig_answered_calls.update_layout(showlegend=False)
+                        st.plotly_chart(fig_answered_calls, use_container_width=True)
+
+
+                        fig2 = px.bar(
+                            selected_agents,
+                            x='agent',
+                            y='Answered_Rate',
+                            title=f'{view_title_prefix}Agents by Answered Rate',
+                            labels={'Answered_Rate': 'Answered Rate (%)', 'agent': 'Agent'},
+                            color='agent',
+                            color_discrete_sequence=px.colors.qualitative.Plotly
+                        )
+                        fig2.update_traces(
+                            hovertemplate="<b>Agent:</b> %{x}<br><b>Answered Rate:</b> %{y:.1f}%<extra></extra>"
+                        )
+                        fig2.update_layout(showlegend=False, yaxis_range=[0, 100])
+                        st.plotly_chart(fig2, use_container_width=True)
+
+                        fig3 = px.bar(
+                            selected_agents,
+                            x='agent',
+                            y='Sales_Follow_Up_Rate',  
+                            title=f'{view_title_prefix}Agents by Sales Follow Up Rate (from Initial Calls)',
+                            labels={'Sales_Follow_Up_Rate': 'Sales Follow Up Rate (%)', 'agent': 'Agent'},  
+                            color='agent',
+                            color_discrete_sequence=px.colors.qualitative.Plotly
+                        )
+                        fig3.update_traces(
+                            hovertemplate="<b>Agent:</b> %{x}<br><b>Sales Follow-Up Rate:</b> %{y:.1f}%<extra></extra>"
+                        )
+                        fig3.update_layout(showlegend=False, yaxis_range=[0, 100])
+                        st.plotly_chart(fig3, use_container_width=True)
+
+                        fig4 = px.bar(
+                            selected_agents,
+                            x='agent',
+                            y='Total_Sales',
+                            title=f'{view_title_prefix}Agents by Total Sales',
+                            labels={'Total_Sales': 'Total Sales ($)', 'agent': 'Agent'},
+                            color='agent',
+                            color_discrete_sequence=px.colors.qualitative.Plotly
+                        )
+                        fig4.update_traces(
+                            hovertemplate="<b>Agent:</b> %{x}<br><b>Total Sales:</b> $%{y:,.2f}<extra></extra>"
+                        )
+                        fig4.update_layout(showlegend=False)
+                        st.plotly_chart(fig4, use_container_width=True)
+
+                        st.markdown("### Performance Metrics Summary")
+                        if not selected_agents.empty:
+                            # One idxmax + .loc lookup per metric instead of two nlargest sorts each
+                            top = {col: selected_agents.loc[selected_agents[col].idxmax()]
+                                   for col in ('Total_Initial_Calls', 'Total_Follow_Up_Calls',
+                                               'Total_Answered_Calls', 'Answered_Rate', 'Total_Sales')}
+                            st.markdown(f"- **Highest Initial Call Volume:** {top['Total_Initial_Calls']['agent']} ({top['Total_Initial_Calls']['Total_Initial_Calls']} calls)")
+                            st.markdown(f"- **Highest Follow-Up Call Volume:** {top['Total_Follow_Up_Calls']['agent']} ({top['Total_Follow_Up_Calls']['Total_Follow_Up_Calls']} calls)")
+                            st.markdown(f"- **Highest Answered Calls:** {top['Total_Answered_Calls']['agent']} ({top['Total_Answered_Calls']['Total_Answered_Calls']} calls)")
+                            st.markdown(f"- **Best Answered Rate:** {top['Answered_Rate']['agent']} ({top['Answered_Rate']['Answered_Rate']:.1f}%)")
+                            st.markdown(f"- **Top Sales Performer:** {top['Total_Sales']['agent']} (${top['Total_Sales']['Total_Sales']:,.2f})")
+                        else:
+                            st.info("No agent data to display summaries.")
+                else:
+                    st.info("No data available for agent performance analysis with current filters.")
+        
+        
+        _render_agent_tab()
+    elif tab_key == "country":
+        @st.fragment
+        def _render_country_tab():
+            with st.container():
+                st.subheader(tabs["country"])
+
+                analysis_type = st.radio("Select Analysis Type", ["Overall Analysis", "Individual Country Analysis"], horizontal=True, key="country_analysis_radio")
+
+                if analysis_type == "Overall Analysis":
+                    # Only this branch needs the full per-country aggregation
+                    country_stats = compute_country_stats(filtered_df, filter_state)
+
+                    st.markdown("### Overall Country Performance")
+                
+                    def show_country_hbar(ranked, col, title, xaxis_title, palette, hover_fmt):
+                        st.plotly_chart(go.Figure(_country_hbar(
+                            tuple(ranked.index), tuple(ranked[col]),
+                            title, xaxis_title, palette, hover_fmt
+                        )), use_container_width=True)
+
+                    # All four unfiltered top-10s from one stacked argpartition
+                    top10 = top_k_multi(country_stats, (
+                        'Total_Initial_Calls', 'Total_Follow_Up_Calls',
+                        'Total_Answered_Calls', 'Total_Sales'))
+
+                    show_country_hbar(
+                        top10['Total_Initial_Calls'], 'Total_Initial_Calls',
+                        "Top 10 Countries by Total Initial Call Volume", 'Total Initial Calls',
+                        'Blues', '<b>%{y}</b><br>Total Initial Calls: %{x}<extra></extra>')
+
+                    show_country_hbar(
+                        top10['Total_Follow_Up_Calls'], 'Total_Follow_Up_Calls',
+                        "Top 10 Countries by Total Follow-Up Call Volume", 'Total Follow-Up Calls',
+                        'Purples', '<b>%{y}</b><br>Total Follow-Up Calls: %{x}<extra></extra>')
+
+                    show_country_hbar(
+                        top10['Total_Answered_Calls'], 'Total_Answered_Calls',
+                        "Top 10 Countries by Total Answered Calls", 'Total Answered Calls',
+                        'Greens', '<b>%{y}</b><br>Total Answered Calls: %{x}<extra></extra>')
+
+                    show_country_hbar(
+                        top_k(country_stats[country_stats['Total_Initial_Calls'] > 0], 'Answered_Rate'),
+                        'Answered_Rate',
+                        "Top 10 Countries by Answered Rate", 'Answered Rate',
+                        'Greens', '<b>%{y}</b><br>Answered Rate: %{x:.2f}%<extra></extra>')
+
+                    show_country_hbar(
+                        country_stats.sort_values('Answered_Rate', ascending=False), 'Answered_Rate',
+                        "All Countries by Answered Rate", 'Answered Rate',
+                        'Greens', '<b>%{y}</b><br>Answered Rate: %{x:.2f}%<extra></extra>')
+
+                    show_country_hbar(
+                        top10['Total_Sales'], 'Total_Sales',
+                        "Top 10 Countries by Total Sales", 'Total Sales',
+                        'Reds', '<b>%{y}</b><br>Total Sales: $%{x:,.2f}<extra></extra>')
+
+                    show_country_hbar(
+                        country_stats.sort_values('Total_Sales', ascending=False), 'Total_Sales',
+                        "All Countries by Total Sales", 'Total Sales',
+                        'Reds', '<b>%{y}</b><br>Total Sales: $%{x:,.2f}<extra></extra>')
+
+
+                elif analysis_type == "Individual Country Analysis":
+                    country_list = sorted(filtered_df['country_name'].cat.remove_unused_categories().cat.categories)
+                    if country_list:
+                        selected_country = st.selectbox("Select a Country", country_list, key="selected_country_selectbox")
+
+                        country_data = compute_country_row(filtered_df, selected_country, filter_state)
+                        if country_data is not None:
+                            st.markdown(f"### Performance for **{selected_country}**")
+                        
+                            total_initial_calls_country = int(country_data['Total_Initial_Calls'])
+                            total_follow_up_calls_country = int(country_data['Total_Follow_Up_Calls'])
+                            total_answered_calls_country = int(country_data['Total_Answered_Calls'])
+                            answered_rate_country = float(country_data['Answered_Rate'])
+                            sales_follow_up_rate_country = float(country_data['Sales_Follow_Up_Rate'])  
+                            total_sales_country = float(country_data['Total_Sales'])
+                            avg_sale_country = float(country_data['Avg_Sale'])
+                                                                        
+                            col1, col2, col3, col4, col5 = st.columns(5)
+                            with col1:
+                                st.metric("Total Initial Calls", total_initial_calls_country)
+                            with col2:  
+                                st.metric("Total Follow-Up Calls", total_follow_up_calls_country)
+                            with col3:
+                                st.metric("Answered Calls", f"{total_answered_calls_country} ({answered_rate_country:.1f}%)")
+                            with col4:
+                                st.metric("Sales Follow Up Rate", f"{sales_follow_up_rate_country:.1f}%")  
+                            with col5:
+                                st.metric("Total Sales", f"${total_sales_country:,.2f}")  
+                        
+                            status_cross, sales_cross = compute_country_dist_crosstabs(filtered_df, filter_state)
+                            country_call_dist = status_cross.loc[selected_country].reindex(['Answered', 'Not answered', 'Voicemail', 'Invalid number'], fill_value=0) if selected_country in status_cross.index else pd.Series(dtype=int)
+                            country_call_dist = country_call_dist[country_call_dist > 0]
+                            call_outcome_colors = {
+                                'Answered': 'green',
+                                'Not answered': 'gray',
+                                'Invalid number': 'red',
+                                'Voicemail': 'blue'
+                            }
+
+                            fig_call = px.pie(
+                                country_call_dist,
+                                names=country_call_dist.index,
+                                values=country_call_dist.values,
+                                title=f"{selected_country} - Call Outcome",
+                                hole=0.4,
+                                color=country_call_dist.index,
+                                color_discrete_map=call_outcome_colors
+                            )
+                            fig_call.update_traces(
+                                hovertemplate="<b>%{label}</b><br>Calls: %{value}<br>Share: %{percent:.2f}%",
+                                textinfo='percent+label',
+                                texttemplate='%{percent:.0%}' if '%{percent}' != '0%' else '',
+                                textposition='inside'
+                            )
+                            st.plotly_chart(fig_call, use_container_width=True)
+
+                            sales_row = sales_cross.loc[selected_country] if selected_country in sales_cross.index else pd.Series(dtype=int)
+                            country_sales_dist = sales_row[sales_row > 0]
+                            valid_sales_statuses_country = country_sales_dist.index.tolist()
+                        
+                            dynamic_sales_colors = _sales_color_map(valid_sales_statuses_country)
+
+
+                            fig_sales = px.pie(
+                                country_sales_dist,
+                                names=country_sales_dist.index,
+                                values=country_sales_dist.values,
+                                title=f"{selected_country} - Sales Status",
+                                hole=0.4,
+                                color=country_sales_dist.index,
+                                color_discrete_map=dynamic_sales_colors
+                            )
+                            fig_sales.update_traces(
+                                hovertemplate="<b>%{label}</b><br>Leads: %{value}<br>Share: %{percent:.2f}%",
+                                textinfo='percent+label',
+                                texttemplate='%{percent:.0%}' if '%{percent}' != '0%' else '',
+                                textposition='inside'
+                            )
+                            st.plotly_chart(fig_sales, use_container_width=True)
+
+                        else:
+                            st.warning(f"No data available for {selected_country}.")
+                    else:
+                        st.info("No countries found in the filtered data to analyze.")
+                else:
+                    st.info("No data available for country analysis with current filters.")
+        
+        _render_country_tab()
+    elif tab_key == "call":
+        with st.container():
+            st.subheader(tabs["call"])
+
+            if not filtered_df.empty:
+                color_map = {
+                    'Answered': 'green',
+                    'Not answered': 'gray',
+                    'Voicemail': 'blue',
+                    'Invalid number': 'red'
+                }
+
+                outcome_dist = compute_outcome_dist(filtered_df, filter_state)
+
+                if not outcome_dist.empty:
+                    outcome_df = outcome_dist.reset_index()
+                    outcome_df.columns = ['call_outcome', 'Percentage']
+
+                    fig = px.bar(
+                        outcome_df,
+                        x='call_outcome',
+                        y='Percentage',
+                        title="Call Outcome Distribution by Status",
+                        color='call_outcome',
+                        color_discrete_map=color_map,
+                        text=outcome_df['Percentage'].astype(str) + '%'
+                    )
+                    fig.update_traces(
+                        textposition='outside',
+                        hovertemplate='<b>Outcome:</b> %{x}<br><b>Percentage:</b> %{y:.1f}%<extra></extra>'
+                    )
+                    fig.update_layout(
+                        yaxis_title="Percentage (%)",
+                        xaxis_title="Call Outcome",
+                        hoverlabel=dict(
+                            bgcolor="black",
+                            font_size=12,
+                            font_family="Arial",
+                            font_color="white",
+                            bordercolor="lightgray"
+                        )
+                    )
+
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    fig2 = px.pie(
+                        outcome_df,
+                        names='call_outcome',
+                        values='Percentage',
+                        title="Call Outcome Distribution by Status (Donut Chart)",
+                        hole=0.4,
+                        color='call_outcome',
+                        color_discrete_map=color_map
+                    )
+                    fig2.update_traces(
+                        hovertemplate='<b>%{label}</b><br><b>Percentage:</b> %{percent}',
+                        textinfo='percent+label',
+                        text=outcome_dist.round(1).astype(str) + '%'
+                    )
+
+                    fig2.update_layout(
+                        hoverlabel=dict(
+                            bgcolor="black",
+                            font_size=12,
+                            font_family="Arial",
+                            font_color="white",
+                            bordercolor="lightgray"
+                        )
+                    )
+
+                    st.plotly_chart(fig2, use_container_width=True)
+                else:
+                    st.info("No valid call outcome data found with current filters.")
+
+
+    elif tab_key == "pipeline":
+        @st.fragment
+        def _render_pipeline_tab():
+            with st.container():
+                st.subheader(tabs["pipeline"])
+            
+                pipeline_dist, cross, final_valid_statuses_pipeline = compute_pipeline_stats(filtered_df, filter_state)
+
+                if not pipeline_dist.empty:
+                    color_map_pipeline = _sales_color_map(final_valid_statuses_pipeline)
+
+                    # Cached figure dicts (keyed on the plotted values) skip the px
+                    # construction/validation pass when only the radio below changes
+                    fig1_dict = _pipeline_pie(
+                        tuple(pipeline_dist.index),
+                        tuple(int(v) for v in pipeline_dist.to_numpy()),
+                        tuple(color_map_pipeline[s] for s in pipeline_dist.index)
+                    )
+                    st.plotly_chart(go.Figure(fig1_dict), use_container_width=True)
+
+                    st.markdown("### Key Sales Pipeline Rates:")
+                
+                    st.markdown("---")
+
+                    view_option = st.radio("Select Country View", ["Top 5 Countries", "All Countries"], horizontal=True, key="pipeline_country_view_radio")
+
+                    if not cross.empty:
+                        if view_option == "Top 5 Countries":
+                            cross_display = top_k(cross, 'Converted', k=5, ascending=False)
+                            view_title_suffix = " (Top 5 Converting Countries)"
+                        else:
+                            cross_display = cross
+                            view_title_suffix = ""
+
+                        fig2_dict = _pipeline_stack_fig(
+                            tuple(cross_display.index),
+                            tuple(tuple(cross_display[s]) for s in final_valid_statuses_pipeline),
+                            tuple(final_valid_statuses_pipeline),
+                            tuple(color_map_pipeline[s] for s in final_valid_statuses_pipeline),
+                            f"Sales Status Distribution by Country{view_title_suffix}"
+                        )
+                        st.plotly_chart(go.Figure(fig2_dict), use_container_width=True)
+                    else:
+                        st.info("No 'Answered' calls with valid sales statuses found for the selected filters to display the pipeline analysis.")
+                else:
+                    st.info("No 'Answered' calls found for the selected filters to display the pipeline analysis.")
+
+
+    
+        _render_pipeline_tab()
+    elif tab_key == "followup":  
+        with st.container():
+            st.subheader(tabs["followup"])
+
+            st.markdown("---")
+            st.markdown("### 📊 Follow-Up Call Counts by Agent")
+
+            if not filtered_df.empty:
+                # 'total_follow_up_calls' is calculated in load_full_sales_data_from_db to include 2nd-10th calls
+                agent_follow_up_counts = compute_agent_follow_up_counts(filtered_df, filter_state)
+
+                if not agent_follow_up_counts.empty:
+                    fig_agent_follow_ups = px.bar(
+                        x=agent_follow_up_counts.index.astype(str),
+                        y=agent_follow_up_counts.values,
+                        title='Total Follow-Up Calls by Agent',
+                        labels={'x': 'Agent', 'y': 'Number of Follow-Up Calls'},
+                        color=agent_follow_up_counts.values,
+                        color_continuous_scale='Purples'
+                    )
+                    fig_agent_follow_ups.update_traces(hovertemplate="<b>Agent:</b> %{x}<br><b>Follow-Up Calls:</b> %{y}<extra></extra>")
+                    fig_agent_follow_ups.update_layout(xaxis_title='Agent', yaxis_title='Total Follow-Up_Calls')
+                    st.plotly_chart(fig_agent_follow_ups, use_container_width=True)
+                else:
+                    st.info("No agents found with recorded follow-up calls in the filtered data.")
+            else:
+                st.info("No data available for follow-up call counting.")
+            
+            st.markdown("---")
+            
+            analysis_reference_date = end_date
+
+            # --- Section 1: Upcoming Follow-Up Calls (based on next_follow_up_date) ---
+            st.markdown("### 🗓️ Upcoming Follow-Up Calls")
+            
+            # Filter for rows that have a future 'next_follow_up_date'
+            upcoming_scheduled_df = filtered_df[
+                (filtered_df['next_follow_up_date'].notna()) &
+                (filtered_df['next_follow_up_date'] > pd.Timestamp(analysis_reference_date))
+            ]
+
+            if not upcoming_scheduled_df.empty:
+                # Columns to include, ensuring 'name' is in the initial list
+                display_cols_base = ['agent', 'name', 'country_name', 'email', 'number', 'next_follow_up_date', 'next_follow_up_time']
+                
+                
+                # Combine base and call date columns, and filter to only include existing columns in the DataFrame
+                display_cols_upcoming_final = [col for col in (display_cols_base) if col in upcoming_scheduled_df.columns]
+                
+                upcoming_scheduled_df_display = upcoming_scheduled_df[display_cols_upcoming_final].sort_values(by='next_follow_up_date', ascending=True)
+                
+                # Define a common rename map for consistency across sections
+                common_rename_map = {
+                    'agent': 'Agent', 
+                    'name': 'Name', 
+                    'country_name': 'Country', 
+                    'email': 'Email', 
+                    'number': 'Number', 
+                    'next_follow_up_date': 'Next Follow Up Date', 
+                    'next_follow_up_time': 'Next Follow Up Time'
+                }
+                
+                upcoming_scheduled_df_display = upcoming_scheduled_df_display.rename(columns=common_rename_map)
+
+                st.write(f"### Upcoming Follow-Up Calls ({len(upcoming_scheduled_df_display)} entries):")
+                st.dataframe(upcoming_scheduled_df_display.reset_index(drop=True), use_container_width=True)
+            else:
+                st.info("No upcoming follow-up calls scheduled with current filters.")
+
+
+
+            st.markdown("---")
+            # --- Section 3: Follow Up Meetings Completed So Far (All actual past call dates) ---
+            st.markdown("### ✅ Follow Up Calls Completed So Far")
+
+            # 'next_follow_up_date' is the only past-call stage tracked today
+            # ('first_call_date' is covered by the initial-call metrics). A
+            # vectorized mask + column slice stages the completed events in one
+            # shot instead of iterating rows in Python.
+            fu_dates = filtered_df['next_follow_up_date']
+            # Keep only call dates within the selected filter range (inclusive of end_date)
+            completed_mask = fu_dates.notna() & (fu_dates <= pd.Timestamp(end_date))
+            completed_events_df = filtered_df.loc[
+                completed_mask,
+                ['agent', 'name', 'email', 'number', 'country_name', 'sales_status', 'next_follow_up_date']
+            ].rename(columns={
+                'agent': 'Agent',
+                'name': 'Name',
+                'email': 'Email',
+                'number': 'Number',
+                'country_name': 'Country',
+                'sales_status': 'Sales Status',
+                'next_follow_up_date': 'Follow Up Date'
+            })
+            completed_events_df['Call Stage'] = 'Next Follow-Up Call Completed'
+
+            if not completed_events_df.empty:
+                # --- MODIFICATION START ---
+                # Re-evaluate drop_duplicates:
+                # If you want the count of "completed_events_df" to EXACTLY match "total_follow_up_calls_overall",
+                # and "total_follow_up_calls_overall" performs no further deduplication than what happens when
+                # summing the individual boolean `notna() & <= filter_end_date` flags,
+                # then this `drop_duplicates` line must be removed or commented out for a direct count match.
+                # The assumption is that each valid date entry (first_call_date or next_follow_up_date) represents
+                # a unique call event to be counted.
+                # completed_events_df = completed_events_df.drop_duplicates(
+                #     subset=['Name', 'Follow Up Date', 'Call Stage'], keep='first'
+                # )
+                # --- MODIFICATION END ---
+                
+                completed_events_df = completed_events_df.sort_values(by='Follow Up Date', ascending=False)
+
+                st.info(f"You have completed {len(completed_events_df)} follow-up meetings so far!")
+                display_cols_completed = ['Agent', 'Name', 'Email', 'Number', 'Country', 'Sales Status', 'Follow Up Date', 'Call Stage']
+                st.dataframe(completed_events_df[display_cols_completed].reset_index(drop=True), use_container_width=True)
+            else:
+                st.info("No past follow-up meetings found.")
+
+    elif tab_key == "report":
+        with st.container():
+            st.subheader(tabs["report"])
+            st.subheader("📥 Generate and Download Report")
+
+            if not filtered_df.empty:
+                # Only the report timestamp is rerun-dependent; the metrics are
+                # cached per filter state like the other tab aggregations
+                report_date = datetime.now().strftime('%Y-%m-%d %H:%M')
+                report = compute_report_metrics(filtered_df, filter_state)
+                date_range = report['date_range']
+                total_entries = report['total_entries']
+                total_initial_calls_report = report['total_initial_calls']
+                total_follow_up_calls_report = report['total_follow_up_calls']
+                total_answered_calls_report = report['total_answered_calls']
+                answered_rate_report = report['answered_rate']
+                total_sales_report = report['total_sales']
+                top_agents_report = report['top_agents']
+                top_countries_report = report['top_countries']
+                outcome_summary_report = report['outcome_summary']
+
+                report_df = pd.DataFrame({
+                    'Metric': [
+                        'Report Date', 'Date Range', 'Total Dataset Entries', 'Total Initial Calls', 'Total Follow-Up Calls',
+                        'Total Answered Calls', 'Answered Rate', 'Total Sales',
+                        'Top 3 Agents', 'Top 3 Countries', 'Common Issues'
+                    ],
+                    'Value': [
+                        report_date, date_range, total_entries, total_initial_calls_report, total_follow_up_calls_report,
+                        total_answered_calls_report,
+                        f"{answered_rate_report:.1f}%", f"${total_sales_report:,.2f}" if not pd.isna(total_sales_report) else "N/A",
+                        ", ".join(top_agents_report), ", ".join(top_countries_report), ", ".join(outcome_summary_report)
+                    ]
+                })
+
+                st.dataframe(report_df)
+
+                st.download_button(
+                    label="📄 Download CSV Report",
+                    data=report_df.to_csv(index=False).encode('utf-8'),
+                    file_name=f"sales_report_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                    mime='text/csv',
+                    key="download_report_button"
+                )
+            else:
+                st.info("No data available to generate a report with current filters.")
+else:
+    st.info("No sales data available to display the dashboard. Please check your data source or filters.")
@@ -1,6 +1,7 @@
-import psycopg2.extras
+import psycopg2
 import gspread
 import pandas as pd
+import io
 import os
 from datetime import datetime
 import json
@@ -31,6 +32,12 @@ PG_PORT = os.getenv("PG_PORT", "5432")
 
 GOOGLE_SHEET_NAME = "Your Sheet"
 WORKSHEET_NAME = "Your Worksheet"
+# Optional: the spreadsheet key from the sheet URL. open_by_key is a direct
+# lookup, while open() by name enumerates the account's Drive files.
+GOOGLE_SHEET_KEY = os.getenv("GOOGLE_SHEET_KEY", "")
+
+# Deletion table for currency formatting in sales_amount ('$1,234' -> '1234')
+_CURRENCY_TABLE = str.maketrans('', '', '$,')
 
 # Define expected DB columns
 expected_db_columns = [
@@ -39,25 +46,56 @@ expected_db_columns = [
     'sales_amount', 'next_follow_up_time', 'next_follow_up_date', 'Calling_Stamp', 'Signup_Date'
 ]
 
+# The schema is fixed, so the quoted COPY column list is built once at import
+_COPY_COLUMN_LIST = ", ".join(f'"{col}"' for col in expected_db_columns)
+
+# Cached across syncs (the webhook server keeps this module loaded), so
+# repeat webhooks skip the key signing and spreadsheet lookup.
+_gspread_client = None
+_spreadsheet = None
+
 def get_gspread_client():
-    """Initializes and returns a gspread client."""
+    """Initializes and returns a gspread client, reusing it across syncs."""
+    global _gspread_client
+    if _gspread_client is not None:
+        return _gspread_client
     try:
-        gc = gspread.service_account_from_dict(GCP_SERVICE_ACCOUNT_INFO)
-        return gc
+        _gspread_client = gspread.service_account_from_dict(GCP_SERVICE_ACCOUNT_INFO)
+        return _gspread_client
     except Exception as e:
         print(f"Error initializing Google Sheets client: {e}")
         return None
 
+def _open_spreadsheet(gc, spreadsheet_name):
+    """Opens the spreadsheet once and reuses the handle on later syncs."""
+    global _spreadsheet
+    if _spreadsheet is None:
+        if GOOGLE_SHEET_KEY:
+            _spreadsheet = gc.open_by_key(GOOGLE_SHEET_KEY)
+        else:
+            _spreadsheet = gc.open(spreadsheet_name)
+    return _spreadsheet
+
 def fetch_data_from_gsheets(gc, spreadsheet_name, worksheet_name):
     """Fetches data from Google Sheet and returns as a Pandas DataFrame."""
     try:
-        sh = gc.open(spreadsheet_name)
+        sh = _open_spreadsheet(gc, spreadsheet_name)
         worksheet = sh.worksheet(worksheet_name)
-        data = worksheet.get_all_records()
-        df = pd.DataFrame(data)
+        # get_all_values is a single batchGet; get_all_records additionally
+        # built a dict per row in Python before the DataFrame was constructed
+        values = worksheet.get_all_values()
+        if not values:
+            return pd.DataFrame()
+        df = pd.DataFrame(values[1:], columns=values[0])
+        # Arrow-backed strings store the cells as contiguous UTF-8 buffers
+        # instead of per-cell Python objects, so the .str cleanup below runs
+        # on C kernels (the dashboard loader uses the same dtype).
+        df = df.astype({c: 'string[pyarrow]' for c in df.select_dtypes('object').columns})
 
-        # Clean and process data
-        df.columns = df.columns.str.lower().str.strip().str.replace(' ', '_').str.replace('&', 'and')
+        # Clean and process data (plain str methods in one pass — the .str
+        # accessor chain built four intermediate Index objects for a handful
+        # of headers)
+        df.columns = [c.lower().strip().replace(' ', '_').replace('&', 'and') for c in df.columns]
 
         if 'customer_name' in df.columns:
             df.rename(columns={'customer_name': 'name'}, inplace=True)
@@ -66,35 +104,46 @@ def fetch_data_from_gsheets(gc, spreadsheet_name, worksheet_name):
             df.rename(columns={'agent_name': 'agent'}, inplace=True)
 
         if 'sales_amount' in df.columns:
-            df['sales_amount'] = df['sales_amount'].astype(str).str.replace(r'[$,]', '', regex=True)
-            df['sales_amount'] = pd.to_numeric(df['sales_amount'], errors='coerce').fillna(0)
+            # str.translate strips the currency characters with a C-level
+            # table lookup instead of running the regex engine per cell
+            s = df['sales_amount'].astype(str).str.translate(_CURRENCY_TABLE)
+            df['sales_amount'] = pd.to_numeric(s, errors='coerce').fillna(0.0)
 
         date_cols_from_sheet = [
             'first_call_date', 'next_follow_up_date'
         ]
         for col in date_cols_from_sheet:
             if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
+                # Explicit format keeps parsing on the C strptime path (the
+                # sheet emits ISO dates) and cache=True reuses parses of the
+                # heavily repeated date strings. Staying on datetime64[ns]
+                # instead of .dt.date keeps later column ops vectorized; the
+                # COPY writer formats these back to plain dates.
+                df[col] = pd.to_datetime(df[col], format='%Y-%m-%d', errors='coerce', cache=True)
 
-        # Filter out rows with null or empty email BEFORE reordering
+        # Filter out rows with null or empty email BEFORE reordering.
+        # One str.len pass on the Arrow column replaces the notnull/compare/AND
+        # trio (three full scans and two intermediate boolean arrays).
         initial_rows = len(df)
-        df = df[df['email'].notnull() & (df['email'] != '')]
+        mask = df['email'].str.len().gt(0).fillna(False)
+        df = df.loc[mask.to_numpy()]
         filtered_rows = len(df)
         if initial_rows != filtered_rows:
             print(f"[{datetime.now()}] INFO: Filtered out {initial_rows - filtered_rows} rows due to null or empty emails.")
 
-        # Reorder columns to match PostgreSQL schema
-        df_reordered = pd.DataFrame(columns=expected_db_columns)
+        # Reorder columns to match the PostgreSQL schema in one constructor
+        # call; per-column assignment re-consolidates the frame every time
+        data = {}
         for col in expected_db_columns:
             if col in df.columns:
-                df_reordered[col] = df[col]
+                data[col] = df[col]
+            elif col == 'sales_amount':
+                data[col] = pd.Series(0.0, index=df.index)
+            elif 'date' in col.lower():
+                data[col] = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
             else:
-                if col == 'sales_amount':
-                    df_reordered[col] = 0.0
-                elif 'date' in col:
-                    df_reordered[col] = pd.NaT
-                else:
-                    df_reordered[col] = ''
+                data[col] = pd.Series('', index=df.index)
+        df_reordered = pd.DataFrame(data, copy=False)
         print(f"[{datetime.now()}] INFO: Dataframe prepared with {len(df_reordered)} rows for insertion.")
 
         return df_reordered
@@ -121,8 +170,16 @@ def fetch_data_from_gsheets(gc, spreadsheet_name, worksheet_name):
 #         print(f"Error fetching existing emails: {e}")
 #         return []
 
+# The table only needs ensuring once per process; later syncs skip the DDL
+_table_ensured = False
+
 def insert_data_to_postgres(df, table_name, db_host, db_name, db_user, db_password, db_port, expected_cols):
     """Inserts or updates data into PostgreSQL."""
+    global _table_ensured
+    # Guard the truncate-and-load: an empty fetch must not wipe the table
+    if df.empty:
+        print(f"[{datetime.now()}] No rows to load; leaving existing '{table_name}' data untouched.")
+        return
     conn = None
     try:
         conn = psycopg2.connect(
@@ -134,6 +191,13 @@ def insert_data_to_postgres(df, table_name, db_host, db_name, db_user, db_passwo
         )
         cur = conn.cursor()
 
+        # The whole load runs as ONE transaction: a single commit means one
+        # fsync instead of three, and TRUNCATE + COPY in the same transaction
+        # lets Postgres skip WAL for the copied rows (with wal_level=minimal).
+        # SET LOCAL only lasts for this transaction, so a crash mid-load still
+        # leaves the previous data intact.
+        cur.execute("SET LOCAL synchronous_commit = off;")
+
         # --- STEP 1: Ensure table exists first (ALWAYS RUN THIS FIRST) ---
         create_table_sql = f"""
         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -158,50 +222,48 @@ def insert_data_to_postgres(df, table_name, db_host, db_name, db_user, db_passwo
             "Signup_Date" DATE
         );
         """
-        cur.execute(create_table_sql)
-        conn.commit()
-        print(f"[{datetime.now()}] Table '{table_name}' ensured to exist with correct schema.")
+        if not _table_ensured:
+            cur.execute(create_table_sql)
+            print(f"[{datetime.now()}] Table '{table_name}' ensured to exist with correct schema.")
         # --- END CREATE TABLE ---
 
         # --- STEP 2: Now that table exists, TRUNCATE it to clear old data ---
         cur.execute(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE;")
-        conn.commit()
+        # Drop the filter index during the load so COPY doesn't maintain it
+        # row by row; it is rebuilt in one pass below.
+        cur.execute(f"DROP INDEX IF EXISTS idx_{table_name}_filters;")
         print(f"[{datetime.now()}] Table '{table_name}' truncated.")
         # --- END TRUNCATE ---
 
-        # Prepare SQL for insertion (simple INSERT, as table is empty after truncate)
-        cols = ", ".join([f'"{col}"' for col in expected_cols])
-        placeholders = ", ".join(["%s"] * len(expected_cols))
-        # Remove update_set and ON CONFLICT DO UPDATE part for a simple INSERT as per earlier discussion
-        # If you still want ON CONFLICT DO UPDATE functionality (e.g., if ID is the PK for updates, but emails can be duplicates)
-        # you would re-add that logic, but if aiming for simple truncate/load, plain INSERT is sufficient.
-        # For this scenario, assuming you want all rows inserted regardless of email uniqueness after ID became PK:
-        insert_sql = f"""
-        INSERT INTO {table_name} ({cols})
-        VALUES ({placeholders});
-        """
-        # If you keep the "ON CONFLICT (email) DO UPDATE" and email is no longer PK, it will error.
-        # If you want to insert ALL rows including duplicates (since email is no longer PK), use simple INSERT.
-        # If you want to use the new 'id' as PK for UPSERT, the logic becomes different.
-        # For "all the data", a simple INSERT (after TRUNCATE) is best.
-
-        data_to_insert = []
-        for index, row in df.iterrows():
-            processed_row = []
-            for col in expected_cols:
-                value = row[col]
-                if pd.isna(value):
-                    processed_row.append(None)
-                elif isinstance(value, str) and value.strip() == '':
-                    processed_row.append(None)
-                else:
-                    processed_row.append(value)
-            data_to_insert.append(tuple(processed_row))
-
-        # Insert records
-        psycopg2.extras.execute_batch(cur, insert_sql, data_to_insert) # Use insert_sql here
+        # --- STEP 3: Bulk-load via COPY (one stream instead of per-row INSERTs) ---
+        # Keep the old per-row semantics: NaN/NaT and blank strings become NULL.
+        df = df.copy()
+        for col in expected_cols:
+            s = df[col]
+            if s.dtype == object or isinstance(s.dtype, pd.StringDtype):
+                stripped = s.fillna('').astype(str).str.strip()
+                df[col] = s.mask(stripped == '')
+
+        copy_sql = f"COPY {table_name} ({_COPY_COLUMN_LIST}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+
+        # Stream in slices so the in-memory CSV buffer stays bounded for large sheets
+        total_rows = len(df)
+        chunk_size = 50_000
+        for start in range(0, total_rows, chunk_size):
+            buf = io.StringIO()
+            df.iloc[start:start + chunk_size].to_csv(
+                buf, index=False, header=False, na_rep='\\N', columns=expected_cols,
+                date_format='%Y-%m-%d'
+            )
+            buf.seek(0)
+            cur.copy_expert(copy_sql, buf)
+
+        # Rebuild the dashboard's filter-pushdown index in one pass over the
+        # freshly loaded table (date range + agent/country predicates)
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_filters ON {table_name} (first_call_date, agent, country_name);")
         conn.commit()
-        print(f"[{datetime.now()}] Successfully inserted {len(data_to_insert)} records after truncation.")
+        _table_ensured = True
+        print(f"[{datetime.now()}] Successfully inserted {total_rows} records after truncation.")
 
     except psycopg2.Error as e:
         print(f"Error with PostgreSQL: {e}")
@@ -1,59 +1,68 @@
-from flask import Flask, request, jsonify
-import subprocess
-import os
-from datetime import datetime
-
-app = Flask(__name__)
-
-# IMPORTANT: Set this to a strong, secret key for basic security
-# Google Apps Script will send this key in the header
-WEBHOOK_SECRET_KEY = os.getenv("WEBHOOK_SECRET_KEY", "a_secret_key")
-
-@app.route('/sync-sheets', methods=['POST'])
-def sync_sheets():
-    # Basic security check: Validate the secret key
-    if request.headers.get('X-Secret-Key') != WEBHOOK_SECRET_KEY:
-        print(f"[{datetime.now()}] Unauthorized access attempt.")
-        return jsonify({"message": "Unauthorized"}), 401
-
-    # Log the request
-    print(f"[{datetime.now()}] Webhook received, initiating sync...")
-
-    # Define the path to your main synchronization script
-    # This assumes 'google_sheets_to_postgres_sync.py' is in the SAME directory as 'webhook_server.py'
-    sync_script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'google_sheets_to_postgres_sync.py')
-
-    if not os.path.exists(sync_script_path):
-        print(f"[{datetime.now()}] Error: Sync script not found at {sync_script_path}")
-        return jsonify({"message": "Server error: Sync script not found"}), 500
-
-    try:
-        # Execute your main sync script and capture its output for debugging.
-        # subprocess.run is blocking, meaning the Flask app waits for the sync script to finish.
-        # This is good for debugging to see all output immediately.
-        result = subprocess.run(['python3', sync_script_path],
-                                capture_output=True, # Captures stdout and stderr
-                                text=True,           # Decodes output as text
-                                check=False)         # Do not raise CalledProcessError for non-zero exit codes
-
-        # Log the sync script's output and errors to the Flask server's console
-        if result.stdout:
-            print(f"[{datetime.now()}] Sync Script STDOUT:\n{result.stdout}")
-        if result.stderr:
-            print(f"[{datetime.now()}] Sync Script STDERR:\n{result.stderr}")
-
-        if result.returncode == 0:
-            print(f"[{datetime.now()}] Sync process for '{sync_script_path}' completed successfully.")
-            # You might want to return the sync script's output in the JSON response for more detailed Apps Script logging
-            return jsonify({"message": "Sync process completed successfully!", "sync_output": result.stdout, "sync_error": result.stderr}), 200
-        else:
-            print(f"[{datetime.now()}] Sync process for '{sync_script_path}' failed with exit code {result.returncode}.")
-            return jsonify({"message": f"Sync process failed with exit code {result.returncode}", "sync_output": result.stdout, "sync_error": result.stderr}), 500
-
-    except Exception as e:
-        print(f"[{datetime.now()}] Failed to launch or monitor sync script: {e}")
-        return jsonify({"message": f"Failed to initiate sync: {str(e)}"}), 500
-
-if __name__ == '__main__':
-    print(f"[{datetime.now()}] Starting Flask webhook server on port 5000...")
-    app.run(host='0.0.0.0', port=5000)
+from flask import Flask, request, jsonify
+from concurrent.futures import ThreadPoolExecutor
+import os
+from datetime import datetime
+
+app = Flask(__name__)
+
+# IMPORTANT: Set this to a strong, secret key for basic security
+# Google Apps Script will send this key in the header
+WEBHOOK_SECRET_KEY = os.getenv("WEBHOOK_SECRET_KEY", "a_secret_key")
+
+# Single worker so overlapping webhooks queue up instead of racing the
+# truncate-and-load; running in-process also avoids a fresh interpreter
+# (and the pandas/psycopg2 import cost) per webhook.
+_sync_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def _run_sync():
+    """Full sheet-to-Postgres sync; runs on the executor thread."""
+    try:
+        # Imported lazily so a missing credentials file surfaces in the sync
+        # log rather than preventing the server from starting.
+        import google_sheets_to_postgres_sync as sync
+
+        print(f"[{datetime.now()}] Starting sync process...")
+        gc_client = sync.get_gspread_client()
+        if gc_client is None:
+            print(f"[{datetime.now()}] Google Sheets client initialization failed.")
+            return
+
+        df_sheets = sync.fetch_data_from_gsheets(gc_client, sync.GOOGLE_SHEET_NAME, sync.WORKSHEET_NAME)
+        if df_sheets.empty:
+            print(f"[{datetime.now()}] No data fetched. Skipping sync.")
+            return
+
+        sync.insert_data_to_postgres(
+            df_sheets, "sales_data",
+            sync.PG_HOST, sync.PG_DBNAME, sync.PG_USER, sync.PG_PASSWORD, sync.PG_PORT,
+            sync.expected_db_columns
+        )
+        print(f"[{datetime.now()}] Sync finished.")
+    except SystemExit:
+        # The sync module exits if its service account file is unusable
+        print(f"[{datetime.now()}] Sync aborted: service account credentials unavailable.")
+    except Exception as e:
+        print(f"[{datetime.now()}] Sync failed: {e}")
+
+
+@app.route('/sync-sheets', methods=['POST'])
+def sync_sheets():
+    # Basic security check: Validate the secret key
+    if request.headers.get('X-Secret-Key') != WEBHOOK_SECRET_KEY:
+        print(f"[{datetime.now()}] Unauthorized access attempt.")
+        return jsonify({"message": "Unauthorized"}), 401
+
+    # Log the request and hand the sync to the background worker; the
+    # handler returns immediately so Apps Script never waits on the load.
+    print(f"[{datetime.now()}] Webhook received, queueing sync...")
+    _sync_executor.submit(_run_sync)
+    return jsonify({"message": "Sync accepted"}), 202
+
+
+# In production, serve with a threaded worker pool instead of the Werkzeug
+# dev server so concurrent webhooks/healthchecks don't serialize:
+#   gunicorn -w 2 -k gthread --threads 4 --bind 0.0.0.0:5000 webhook_server:app
+if __name__ == '__main__':
+    print(f"[{datetime.now()}] Starting Flask webhook server on port 5000...")
+    app.run(host='0.0.0.0', port=5000, threaded=True)